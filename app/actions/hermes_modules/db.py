@@ -8,6 +8,8 @@ import sqlite3
 import unicodedata
 import json
 
+from utils.sqlite_tuning import tune_sqlite, SHARED_PRAGMAS
+
 from .config import DB_PATH
 
 
@@ -41,7 +43,8 @@ def _normalize_search(text: str) -> str:
 
 def _get_connection() -> sqlite3.Connection:
     """Crée une connexion SQLite avec injection de la fonction normalize_search."""
-    conn = sqlite3.connect(str(DB_PATH))
+    # Lectures concurrentes de l'écriture temps réel du Scribe
+    conn = tune_sqlite(sqlite3.connect(str(DB_PATH)), SHARED_PRAGMAS)
     conn.row_factory = sqlite3.Row
     
     # === INJECTION CRITIQUE ===
@@ -241,7 +241,8 @@ def dispatch_tool(tool_name: str, arguments: dict):
         # === OUTILS KNOWLEDGE (Mémoire persistante Iris) ===
         elif tool_name == "read_knowledge":
             result = read_knowledge(
-                fichier=arguments.get("fichier")
+                fichier=arguments.get("fichier"),
+                lister_disponibles=True
             )
             if result.get("status") == "success":
                 return result.get("contenu")
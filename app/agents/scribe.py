@@ -30,6 +30,7 @@ import json
 import time
 import tiktoken
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
 from dataclasses import dataclass
@@ -44,6 +45,7 @@ if str(app_dir) not in sys.path:
 
 from utils.trildasa_engine import TrildasaEngine
 from utils.nettoyer_text import nettoyer_segment
+from utils.sqlite_tuning import tune_sqlite, SHARED_PRAGMAS
 
 
 # Configuration
@@ -79,6 +81,24 @@ VLLM_RETRY_DELAY = 5
 SCRIBE_VERSION = "4.2"
 
 
+def _connect() -> sqlite3.Connection:
+    """Ouvre une connexion à metadata.db avec les PRAGMAs partagés (SHARED_PRAGMAS)."""
+    return tune_sqlite(sqlite3.connect(DB_PATH), SHARED_PRAGMAS)
+
+
+# INSERT metadata (schéma v2.1), partagé par les insertions unitaires et par lots
+_SQL_INSERT_METADATA = '''
+    INSERT INTO metadata (
+        timestamp, timestamp_epoch, token_start, token_end,
+        source_file, source_nature, source_format, source_origine,
+        auteur, emotion_valence, emotion_activation,
+        tags_roget, personnes, projets, sujets, lieux,
+        resume_texte, gr_id, confidence_score, vecteur_trildasa,
+        ego_version, modele
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
 @dataclass
 class Echange:
     timestamp: str
@@ -95,7 +115,9 @@ class Scribe:
         self.parallel_batches = parallel_batches
         self.batch_size = batch_size
         self.tag_index = self._load_tag_index()
-        self.db_conn = None
+        # Une connexion SQLite par thread (sqlite3 refuse le partage entre threads) :
+        # le Scribe peut être créé dans un thread et écrire depuis un autre
+        self._local = threading.local()
         self._init_database()
         
         # Initialiser le moteur TriLDaSA
@@ -137,9 +159,10 @@ class Scribe:
         return len(ENCODER.encode(text))
     
     def _get_db_connection(self) -> sqlite3.Connection:
-        if self.db_conn is None:
-            self.db_conn = sqlite3.connect(DB_PATH)
-        return self.db_conn
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect()
+        return conn
     
     def _clean_inline_markers(self, text: str) -> str:
         """
@@ -347,21 +370,10 @@ class Scribe:
         except sqlite3.Error as e:
             print(f"⚠️  Erreur insertion candidat projet: {e}")
     
-    def _insert_metadata(self, timestamp: str, token_start: int, token_end: int,
-                         source_file: str, auteur: str, metadata: dict, 
-                         source_origine: str) -> Optional[int]:
-        """
-        Insère les métadonnées dans la base de données (schéma v2.1).
-        Retourne l'ID du segment créé, ou None si skippé.
-        """
-        # === FILTRE INDEXABLE ===
-        if metadata.get("indexable") == False:
-            self.stats["skipped_phatique"] += 1
-            return None
-        
-        conn = self._get_db_connection()
-        cursor = conn.cursor()
-        
+    def _metadata_row(self, timestamp: str, token_start: int, token_end: int,
+                      source_file: str, auteur: str, metadata: dict,
+                      source_origine: str) -> tuple:
+        """Construit les valeurs d'une ligne metadata (schéma v2.1, ordre de _SQL_INSERT_METADATA)."""
         # Générer le vecteur TriLDaSA
         row_for_vector = self._build_row_for_vector(metadata)
         vecteur_trildasa = self.trildasa_engine.vector_to_json(
@@ -379,17 +391,7 @@ class Scribe:
         gr_id = metadata.get("gr_id")  # Peut être None ou int
         confidence_score = metadata.get("confidence_score", 0.5)  # Default 0.5
         
-        # === INSERT schéma v2.1 ===
-        cursor.execute('''
-            INSERT INTO metadata (
-                timestamp, timestamp_epoch, token_start, token_end,
-                source_file, source_nature, source_format, source_origine,
-                auteur, emotion_valence, emotion_activation,
-                tags_roget, personnes, projets, sujets, lieux,
-                resume_texte, gr_id, confidence_score, vecteur_trildasa,
-                ego_version, modele
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        return (
             timestamp,
             timestamp_epoch,
             token_start,
@@ -412,6 +414,26 @@ class Scribe:
             vecteur_trildasa,
             f"Iris_{SCRIBE_VERSION}",
             "gemini-2.5-flash-lite"
+        )
+    
+    def _insert_metadata(self, timestamp: str, token_start: int, token_end: int,
+                         source_file: str, auteur: str, metadata: dict, 
+                         source_origine: str) -> Optional[int]:
+        """
+        Insère les métadonnées dans la base de données (schéma v2.1).
+        Retourne l'ID du segment créé, ou None si skippé.
+        """
+        # === FILTRE INDEXABLE ===
+        if metadata.get("indexable") == False:
+            self.stats["skipped_phatique"] += 1
+            return None
+        
+        conn = self._get_db_connection()
+        cursor = conn.cursor()
+        
+        # === INSERT schéma v2.1 ===
+        cursor.execute(_SQL_INSERT_METADATA, self._metadata_row(
+            timestamp, token_start, token_end, source_file, auteur, metadata, source_origine
         ))
         conn.commit()
         segment_id = cursor.lastrowid
@@ -434,6 +456,58 @@ class Scribe:
         self.stats["indexed"] += 1
         return segment_id
     
+    def _insert_metadata_many(self, rows: List[Tuple[str, int, int, str, dict]],
+                              source_file: str, source_origine: str) -> int:
+        """
+        Insère plusieurs segments (timestamp, token_start, token_end, auteur, metadata)
+        en un seul executemany, dans une seule transaction (candidats inclus).
+        Retourne le nombre de segments insérés.
+        """
+        kept = []
+        for timestamp, token_start, token_end, auteur, metadata in rows:
+            # === FILTRE INDEXABLE ===
+            if metadata.get("indexable") == False:
+                self.stats["skipped_phatique"] += 1
+                continue
+            kept.append((metadata, self._metadata_row(
+                timestamp, token_start, token_end, source_file, auteur, metadata, source_origine
+            )))
+        if not kept:
+            return 0
+        
+        conn = self._get_db_connection()
+        with conn:
+            # Verrou d'écriture pris d'emblée (pas d'escalade en cours de lot)
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(_SQL_INSERT_METADATA, [values for _, values in kept])
+            # Une seule connexion écrit dans la transaction : ids consécutifs
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            first_id = last_id - len(kept) + 1
+            
+            # === Gestion des candidats ===
+            personnes, projets = [], []
+            for segment_id, (metadata, _) in enumerate(kept, first_id):
+                contexte = metadata.get("resume_texte", "")[:200]
+                if metadata.get("personne_candidat"):
+                    personnes.append((metadata["personne_candidat"], contexte, segment_id))
+                if metadata.get("projet_candidat"):
+                    projets.append((metadata["projet_candidat"], contexte, segment_id))
+            if personnes:
+                conn.executemany(
+                    "INSERT INTO personnes_candidats (nom_detecte, contexte, segment_id) VALUES (?, ?, ?)",
+                    personnes
+                )
+            if projets:
+                conn.executemany(
+                    "INSERT INTO projets_candidats (nom_detecte, contexte, segment_id) VALUES (?, ?, ?)",
+                    projets
+                )
+        
+        self.stats["candidats_personnes"] += len(personnes)
+        self.stats["candidats_projets"] += len(projets)
+        self.stats["indexed"] += len(kept)
+        return len(kept)
+    
     # =========================================================================
     # MODE TEMPS RÉEL
     # =========================================================================
@@ -454,7 +528,7 @@ class Scribe:
                 return None
             
             if thread_conn is None:
-                thread_conn = sqlite3.connect(DB_PATH)
+                thread_conn = _connect()
             
             cursor = thread_conn.cursor()
             
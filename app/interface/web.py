@@ -8,40 +8,245 @@ Version: 2.0.0
 - Optimisé pour mobile
 """
 
+import hashlib
 import os
+import queue
+from functools import partial
+import tempfile
+import threading
+from concurrent.futures import Future
 from pathlib import Path
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, request, jsonify, render_template, send_from_directory, make_response
 import requests
+from requests.adapters import HTTPAdapter
 
-# Optionnel: Whisper pour transcription locale
+# Optionnel: orjson pour la sérialisation JSON (C, bien plus rapide que json)
 try:
-    import whisper
+    import orjson
+    from flask.json.provider import JSONProvider
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optionnel: faster-whisper (CTranslate2) pour transcription locale
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    import ctranslate2
     WHISPER_AVAILABLE = True
-    whisper_model = None
 except ImportError:
     WHISPER_AVAILABLE = False
-    whisper_model = None
 
 # === CONFIGURATION ===
 BASE_DIR = Path(__file__).parent
 STATIC_DIR = BASE_DIR / "static"
 BACKEND_URL = os.environ.get("BACKEND_URL", "http://localhost:8182")
 WHISPER_MODEL_SIZE = "medium"
+WHISPER_LOW_VRAM = os.environ.get("WHISPER_LOW_VRAM") == "1"  # int8_float16 sur GPU
+WHISPER_BATCH_SIZE = 8         # Segments VAD encodés par passe
 PORT = int(os.environ.get("PORT", 5050))
+# Chaque worker charge son propre modèle Whisper : peu de workers, la
+# concurrence (surtout de l'attente réseau vers le backend) passe par les threads
+WEB_WORKERS = int(os.environ.get("WEB_WORKERS", 2))
+WEB_THREADS = int(os.environ.get("WEB_THREADS", 16))  # /send attend jusqu'à 120 s
+PRELOAD_WHISPER = os.environ.get("PRELOAD_WHISPER") == "1"
+
+# Cache HTTP des assets PWA (secondes)
+PWA_MAX_AGE = 3600
+ICONS_MAX_AGE = 31536000
+
+
+def _content_etag(path: Path) -> str:
+    """Hash du contenu d'un asset, calculé une fois au démarrage."""
+    try:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+ASSET_ETAGS = {
+    "manifest.json": _content_etag(BASE_DIR / "manifest.json"),
+    "service-worker.js": _content_etag(BASE_DIR / "service-worker.js"),
+    "offline.html": _content_etag(BASE_DIR / "templates" / "offline.html"),
+}
+
+# Session HTTP partagée : connexions keep-alive vers le backend
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=32))
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=32))
+backend_post = partial(SESSION.post, timeout=120)  # Gemini peut prendre du temps avec gros contexte
+backend_get = partial(SESSION.get, timeout=5)
 
 app = Flask(__name__, 
             static_folder=str(STATIC_DIR),
             static_url_path='/static')
 
 
+if ORJSON_AVAILABLE:
+    class OrjsonProvider(JSONProvider):
+        """Fournisseur JSON Flask basé sur orjson (jsonify inchangé)."""
+        
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+    
+    app.json = OrjsonProvider(app)
+
+
+class WhisperManager:
+    """
+    Singleton autour du modèle faster-whisper.
+    
+    - CUDA disponible → float16 sur GPU (int8_float16 si WHISPER_LOW_VRAM=1)
+    - Sinon → int8 sur CPU
+    Chargement paresseux, avec unload() en cas de pression mémoire.
+    """
+    
+    _instance = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance.model = None
+        return cls._instance
+    
+    @staticmethod
+    def _device():
+        """Retourne (device, compute_type) selon le matériel disponible."""
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "cuda", "int8_float16" if WHISPER_LOW_VRAM else "float16"
+        return "cpu", "int8"
+    
+    def get_model(self):
+        """Charge le modèle à la demande (lazy loading)."""
+        if self.model is None:
+            device, compute_type = self._device()
+            print(f"🎤 Chargement du modèle Whisper ({WHISPER_MODEL_SIZE}, {device}/{compute_type})...")
+            self.model = WhisperModel(WHISPER_MODEL_SIZE, device=device, compute_type=compute_type)
+            print("✅ Whisper prêt!")
+        return self.model
+    
+    def unload(self):
+        """Libère le modèle (pression mémoire)."""
+        if self.model is not None:
+            self.model = None
+            # Le pipeline du worker référence aussi le modèle
+            transcription_worker.release()
+            print("🧹 Modèle Whisper déchargé")
+
+
 def get_whisper_model():
     """Charge le modèle Whisper à la demande (lazy loading)."""
-    global whisper_model
-    if WHISPER_AVAILABLE and whisper_model is None:
-        print(f"🎤 Chargement du modèle Whisper ({WHISPER_MODEL_SIZE})...")
-        whisper_model = whisper.load_model(WHISPER_MODEL_SIZE)
-        print("✅ Whisper prêt!")
-    return whisper_model
+    if not WHISPER_AVAILABLE:
+        return None
+    return WhisperManager().get_model()
+
+
+class TranscriptionWorker:
+    """
+    Sérialise les requêtes /transcribe sur un seul thread.
+    
+    Un seul thread possède le modèle : il prend les requêtes dans l'ordre
+    d'arrivée, sans fenêtre d'attente, et les transcrit une à une via
+    BatchedInferencePipeline (segments VAD d'un même audio encodés par lots).
+    Chaque requête HTTP attend un Future rempli par le thread.
+    Le modèle est propre à chaque processus : un worker gunicorn = une copie.
+    """
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
+    
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="whisper-worker", daemon=True)
+                self._thread.start()
+    
+    def submit(self, audio_path: str) -> Future:
+        """Ajoute un fichier audio à la file et retourne son Future."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((audio_path, future))
+        return future
+    
+    def release(self):
+        """Lâche le pipeline (et le modèle qu'il référence) : voir WhisperManager.unload()."""
+        with self._pipeline_lock:
+            self._pipeline = None
+    
+    def _get_pipeline(self):
+        with self._pipeline_lock:
+            if self._pipeline is None:
+                self._pipeline = BatchedInferencePipeline(model=get_whisper_model())
+            return self._pipeline
+    
+    def _transcribe(self, audio_path: str) -> str:
+        # Références locales au pipeline libérées au retour : rien ne retient
+        # le modèle entre deux requêtes une fois release() appelé
+        # Langue fixée (pas de détection sur les 30 premières s),
+        # VAD (silences ignorés), greedy, sans timestamps
+        segments, info = self._get_pipeline().transcribe(
+            audio_path,
+            language="fr",
+            vad_filter=True,
+            beam_size=1,
+            without_timestamps=True,
+            batch_size=WHISPER_BATCH_SIZE,
+        )
+        return "".join(segment.text for segment in segments)
+    
+    def _run(self):
+        while True:
+            audio_path, future = self._queue.get()
+            try:
+                future.set_result(self._transcribe(audio_path))
+            except Exception as e:
+                future.set_exception(e)
+            # Le Future (et une éventuelle trace d'exception) n'est pas retenu ici
+            del audio_path, future
+
+
+transcription_worker = TranscriptionWorker()
+
+
+def preload_whisper(worker=None):
+    """
+    Hook gunicorn post_worker_init : charge Whisper dans le worker, après le fork.
+    
+    CTranslate2 démarre ses pools de threads natifs au chargement : forker
+    ensuite (preload_app) peut bloquer les workers. Aucune requête ne paie
+    le chargement à froid.
+    """
+    get_whisper_model()
+
+
+def _cacheable(response, name: str, max_age: int = PWA_MAX_AGE):
+    """
+    Ajoute ETag + Cache-Control et répond 304 si le client a déjà la version.
+    max_age=None → no-cache : revalidation à chaque chargement (ETag/304).
+    """
+    if ASSET_ETAGS.get(name):
+        response.set_etag(ASSET_ETAGS[name])
+    response.cache_control.public = True
+    if max_age is None:
+        response.cache_control.no_cache = True
+    else:
+        response.cache_control.max_age = max_age
+    return response.make_conditional(request)
+
+
+@app.after_request
+def cache_static_icons(response):
+    """Les icônes ne changent pas : cache navigateur longue durée."""
+    if request.path.startswith("/static/icons/") and response.status_code in (200, 304):
+        response.cache_control.public = True
+        response.cache_control.max_age = ICONS_MAX_AGE
+    return response
 
 
 # === ROUTES PWA ===
@@ -55,19 +260,22 @@ def index():
 @app.route("/manifest.json")
 def manifest():
     """Manifest PWA."""
-    return send_from_directory(BASE_DIR, "manifest.json", mimetype='application/manifest+json')
+    response = send_from_directory(BASE_DIR, "manifest.json", mimetype='application/manifest+json')
+    return _cacheable(response, "manifest.json")
 
 
 @app.route("/service-worker.js")
 def service_worker():
     """Service Worker pour PWA."""
-    return send_from_directory(BASE_DIR, "service-worker.js", mimetype='application/javascript')
+    response = send_from_directory(BASE_DIR, "service-worker.js", mimetype='application/javascript')
+    # Comme nginx.conf : no-cache pour que les mises à jour soient vues aussitôt
+    return _cacheable(response, "service-worker.js", max_age=None)
 
 
 @app.route("/offline.html")
 def offline():
     """Page hors-ligne."""
-    return render_template("offline.html")
+    return _cacheable(make_response(render_template("offline.html")), "offline.html")
 
 
 # === ROUTES API ===
@@ -82,10 +290,9 @@ def send_message():
         return jsonify({"error": "Message vide"}), 400
     
     try:
-        response = requests.post(
+        response = backend_post(
             f"{BACKEND_URL}/alterego",
-            json={"message": message},
-            timeout=120  # Gemini peut prendre du temps avec gros contexte
+            json={"message": message}
         )
         
         if response.ok:
@@ -110,19 +317,19 @@ def send_message():
 def transcribe_audio():
     """Transcrit l'audio via Whisper local."""
     if not WHISPER_AVAILABLE:
-        return jsonify({"error": "Whisper non installé. pip install openai-whisper"}), 501
+        return jsonify({"error": "Whisper non installé. pip install faster-whisper"}), 501
     
     if 'audio' not in request.files:
         return jsonify({"error": "Aucun fichier audio"}), 400
     
     audio_file = request.files['audio']
-    temp_path = "/tmp/temp_audio.wav"
+    # Fichier temporaire unique : plusieurs requêtes peuvent être en vol
+    fd, temp_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
     audio_file.save(temp_path)
     
     try:
-        model = get_whisper_model()
-        result = model.transcribe(temp_path, language="fr")
-        transcription = result.get("text", "")
+        transcription = transcription_worker.submit(temp_path).result()
         
         return jsonify({"transcription": transcription.strip()})
         
@@ -137,15 +344,57 @@ def transcribe_audio():
 def health():
     """Vérifie la santé du backend."""
     try:
-        response = requests.get(f"{BACKEND_URL}/health", timeout=5)
+        response = backend_get(f"{BACKEND_URL}/health")
         if response.ok:
-            return jsonify({"status": "ok", "backend": "connected"})
+            # Statut inchangé → 304 sans corps pour les pings répétés de la PWA
+            result = jsonify({"status": "ok", "backend": "connected"})
+            result.set_etag("health-ok")
+            result.cache_control.no_cache = True
+            return result.make_conditional(request)
         else:
             return jsonify({"status": "degraded", "backend": "error"}), 500
     except:
         return jsonify({"status": "degraded", "backend": "unreachable"}), 503
 
 
+def run_production():
+    """
+    Lance l'app sous gunicorn (workers gthread) au lieu du serveur de dev.
+    Équivalent: gunicorn -k gthread -w 2 --threads 16 --timeout 180 --keep-alive 30 web:app
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("⚠️ gunicorn non installé (pip install gunicorn) → serveur Flask de dev")
+        app.run(host="0.0.0.0", port=PORT, threaded=True)
+        return
+    
+    class StandaloneApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return self.application
+    
+    options = {
+        "bind": f"0.0.0.0:{PORT}",
+        "workers": WEB_WORKERS,
+        "worker_class": "gthread",
+        "threads": WEB_THREADS,
+        "timeout": 180,
+        "keepalive": 30,
+    }
+    if PRELOAD_WHISPER:
+        options["post_worker_init"] = preload_whisper
+    StandaloneApplication(app, options).run()
+
+
 # === DÉMARRAGE ===
 if __name__ == "__main__":
     # Créer le dossier static/icons si nécessaire
@@ -169,6 +418,7 @@ if __name__ == "__main__":
     print(f"📱 Réseau:   http://{local_ip}:{PORT}")
     print(f"🔗 Backend:  {BACKEND_URL}")
     print(f"🎤 Whisper:  {'✅ Disponible' if WHISPER_AVAILABLE else '❌ Non installé'}")
+    print(f"⚙️  Serveur:  {'Flask dev (DEV=1)' if os.environ.get('DEV') else f'gunicorn {WEB_WORKERS} workers × {WEB_THREADS} threads'}")
     print("=" * 60)
     print("📲 Pour installer sur mobile:")
     print(f"   1. Ouvrir http://{local_ip}:{PORT} sur votre téléphone")
@@ -176,4 +426,7 @@ if __name__ == "__main__":
     print("   3. Android: Menu → Installer l'application")
     print("=" * 60)
     
-    app.run(debug=True, host="0.0.0.0", port=PORT)
+    if os.environ.get("DEV"):
+        app.run(debug=True, host="0.0.0.0", port=PORT)
+    else:
+        run_production()
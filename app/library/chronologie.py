@@ -8,6 +8,8 @@ def get_project_timeline(project_keyword: str, limit: int = 10):
     conn = sqlite3.connect(METADATA_DB)
     cursor = conn.cursor()
     
+    # Un seul parcours avec OR : projets contient des tableaux JSON, un
+    # LIKE '%...%' ne peut utiliser aucun index (une UNION ferait deux parcours)
     query = """
     SELECT timestamp, resume_texte 
     FROM metadata 
@@ -23,11 +25,11 @@ def get_project_timeline(project_keyword: str, limit: int = 10):
         if not results:
             return f"Aucune chronologie trouvée pour '{project_keyword}'."
 
-        formatted = f"=== CHRONOLOGIE PROJET : {project_keyword} ===\n"
-        for ts, texte in results:
-            formatted += f"- [{ts}] {texte}\n"
-        return formatted
+        parts = [f"=== CHRONOLOGIE PROJET : {project_keyword} ===\n"]
+        parts.extend(f"- [{ts}] {texte}\n" for ts, texte in results)
+        return "".join(parts)
     except Exception as e:
         return f"Erreur bibliothèque chronologie: {e}"
     finally:
+        conn.execute("PRAGMA optimize")
         conn.close()
\ No newline at end of file
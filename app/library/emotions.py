@@ -1,5 +1,58 @@
-import sqlite3
-from config import METADATA_DB
+from library.metadata_db import get_conn
+
+# Requêtes SQL construites une seule fois par forme de paramètres : texte
+# identique d'un appel à l'autre, donc réutilisé par le cache de statements
+# de la connexion persistante du thread (get_conn)
+# clé: (signe de valence -1/0/1 ou None, activation haute True/False ou None)
+_PREPARED: dict[tuple, str] = {}
+
+
+def _get_query(val_sign, act_high) -> str:
+    """Retourne (et mémorise) la requête SQL pour une forme de paramètres."""
+    key = (val_sign, act_high)
+    query = _PREPARED.get(key)
+    if query is not None:
+        return query
+    
+    conditions = []
+    if val_sign is not None:
+        if val_sign < 0:
+            # Émotions négatives : on cherche valence <= seuil
+            conditions.append("emotion_valence <= ?")
+        else:
+            # Émotions positives : on cherche valence >= seuil
+            conditions.append("emotion_valence >= ?")
+    
+    if act_high is not None:
+        if act_high:
+            # Haute activation : on cherche activation >= seuil
+            conditions.append("emotion_activation >= ?")
+        else:
+            # Basse activation : on cherche activation <= seuil
+            conditions.append("emotion_activation <= ?")
+    
+    # Exclure les valeurs nulles
+    conditions.append("emotion_valence IS NOT NULL")
+    conditions.append("emotion_activation IS NOT NULL")
+    
+    # Tri : priorité aux émotions les plus intenses dans la direction demandée
+    if val_sign is not None and val_sign < 0:
+        order_by = "emotion_valence ASC, emotion_activation DESC"
+    elif val_sign is not None and val_sign > 0:
+        order_by = "emotion_valence DESC, emotion_activation DESC"
+    else:
+        order_by = "emotion_activation DESC"
+    
+    query = f"""
+        SELECT timestamp, resume_texte, emotion_valence, emotion_activation
+        FROM metadata
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {order_by}
+        LIMIT ?
+        """
+    _PREPARED[key] = query
+    return query
+
 
 def get_emotional_resonance(valence: float = None, activation: float = None, limit: int = 5):
     """
@@ -11,62 +64,26 @@ def get_emotional_resonance(valence: float = None, activation: float = None, lim
         activation (float): 0.0 (calme) à 1.0 (intense)
         limit (int): Nombre de résultats (défaut: 5)
     """
-    conn = sqlite3.connect(METADATA_DB)
+    conn = get_conn()
     cursor = conn.cursor()
     
     try:
-        # Construction dynamique de la requête selon les paramètres
-        conditions = []
-        params = []
-        
-        if valence is not None:
-            if valence < 0:
-                # Émotions négatives : on cherche valence <= seuil
-                conditions.append("emotion_valence <= ?")
-                params.append(valence + 0.2)  # Marge de tolérance
-            else:
-                # Émotions positives : on cherche valence >= seuil
-                conditions.append("emotion_valence >= ?")
-                params.append(valence - 0.2)
-        
-        if activation is not None:
-            if activation > 0.5:
-                # Haute activation : on cherche activation >= seuil
-                conditions.append("emotion_activation >= ?")
-                params.append(activation - 0.2)
-            else:
-                # Basse activation : on cherche activation <= seuil
-                conditions.append("emotion_activation <= ?")
-                params.append(activation + 0.2)
-        
         # S'assurer qu'on a des conditions
-        if not conditions:
+        if valence is None and activation is None:
             return "Aucun paramètre émotionnel fourni. Utilise valence et/ou activation."
         
-        # Exclure les valeurs nulles
-        conditions.append("emotion_valence IS NOT NULL")
-        conditions.append("emotion_activation IS NOT NULL")
-        
-        where_clause = " AND ".join(conditions)
-        
-        # Tri : priorité aux émotions les plus intenses dans la direction demandée
-        if valence is not None and valence < 0:
-            order_by = "emotion_valence ASC, emotion_activation DESC"
-        elif valence is not None and valence > 0:
-            order_by = "emotion_valence DESC, emotion_activation DESC"
-        else:
-            order_by = "emotion_activation DESC"
-        
-        query = f"""
-        SELECT timestamp, resume_texte, emotion_valence, emotion_activation
-        FROM metadata
-        WHERE {where_clause}
-        ORDER BY {order_by}
-        LIMIT ?
-        """
+        val_sign = None if valence is None else (valence > 0) - (valence < 0)
+        act_high = None if activation is None else activation > 0.5
         
+        params = []
+        if valence is not None:
+            # Marge de tolérance de 0.2 dans la direction demandée
+            params.append(valence + 0.2 if valence < 0 else valence - 0.2)
+        if activation is not None:
+            params.append(activation - 0.2 if act_high else activation + 0.2)
         params.append(limit)
-        cursor.execute(query, params)
+        
+        cursor.execute(_get_query(val_sign, act_high), params)
         results = cursor.fetchall()
         
         if not results:
@@ -74,15 +91,12 @@ def get_emotional_resonance(valence: float = None, activation: float = None, lim
             return f"Aucun souvenir trouvé dans le quadrant '{quadrant}'."
         
         quadrant = _describe_quadrant(valence, activation)
-        formatted = f"=== RÉSONANCES ÉMOTIONNELLES : {quadrant} ===\n"
-        for ts, texte, val, act in results:
-            formatted += f"- [{ts}] (V:{val:.2f}, A:{act:.2f}) {texte}\n"
-        return formatted
+        parts = [f"=== RÉSONANCES ÉMOTIONNELLES : {quadrant} ===\n"]
+        parts.extend(f"- [{ts}] (V:{val:.2f}, A:{act:.2f}) {texte}\n" for ts, texte, val, act in results)
+        return "".join(parts)
         
     except Exception as e:
         return f"Erreur bibliothèque émotions: {e}"
-    finally:
-        conn.close()
 
 
 def _describe_quadrant(valence: float, activation: float) -> str:
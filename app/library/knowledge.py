@@ -6,7 +6,7 @@ Permet à Iris de lire, enrichir et mettre à jour ses fichiers de connaissance.
 Format: YAML frontmatter + sections Markdown (##)
 
 NOUVEAU v0.11.5 (diff avec v0.10.4):
-- Support complet des liens symboliques (followlinks=True)
+- Support complet des liens symboliques (suivis par os.scandir)
 - Accès aux sous-dossiers (ex: drive_link/blackboard)
 - Résolution de chemin intelligente avec Path.resolve()
 - Fonction _resolve_path() pour centraliser la logique
@@ -24,6 +24,8 @@ from datetime import datetime
 import logging
 import re
 import os
+import stat as stat_module
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
@@ -34,6 +36,17 @@ KNOWLEDGE_DIR = Path("~/Dropbox/aiterego_memory/iris/knowledge").expanduser().re
 # Extensions supportées pour la lecture
 SUPPORTED_EXTENSIONS = {".md", ".txt", ".json", ".yaml", ".yml"}
 
+# Au-delà de ce nombre de fichiers, les stat() sont lancés en parallèle
+# (Dropbox / montage réseau : chaque stat est un aller-retour coûteux)
+PARALLEL_STAT_THRESHOLD = 64
+PARALLEL_STAT_WORKERS = 16
+
+# Regex précompilées pour update_knowledge
+_NEXT_SECTION_RE = re.compile(r'\n#{1,2}\s+\S')
+_SECTIONS_RE = re.compile(r'^#{1,2}\s*(.+?)\s*$', re.MULTILINE)
+_SECTION_HEADER_CACHE: Dict[str, re.Pattern] = {}
+_SECTION_HEADER_CACHE_MAX = 128
+
 
 def _resolve_path(fichier: str) -> tuple[Path, str]:
     """
@@ -83,6 +96,97 @@ def _resolve_path(fichier: str) -> tuple[Path, str]:
     return filepath_resolved, fichier_clean
 
 
+# Dossiers ignorés lors du parcours (évite boucles et bruit)
+EXCLUDED_DIRS = {'__pycache__', 'venv'}
+
+
+def _iter_knowledge_entries(path: str, via_symlink: bool = False):
+    """
+    Parcours récursif via os.scandir, avec suivi des liens symboliques.
+    
+    Les DirEntry portent le type (d_type) en cache : pas de stat() supplémentaire
+    pour distinguer fichiers et dossiers.
+    
+    Yields:
+        tuple (DirEntry, via_symlink) pour chaque fichier supporté
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    for entry in entries:
+        # Ignorer fichiers et dossiers cachés avant tout stat()
+        if entry.name.startswith('.'):
+            continue
+        
+        is_link = via_symlink or entry.is_symlink()
+        
+        if entry.is_dir(follow_symlinks=True):
+            if entry.name not in EXCLUDED_DIRS:
+                yield from _iter_knowledge_entries(entry.path, is_link)
+        elif entry.is_file(follow_symlinks=True):
+            if os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTENSIONS:
+                yield entry, is_link
+
+
+def _stat_entries(entries: list) -> list:
+    """
+    stat() d'une liste de DirEntry, en parallèle si la liste est grande.
+    
+    os.stat relâche le GIL : plusieurs threads laissent le noyau traiter
+    les allers-retours vers le stockage en parallèle au lieu de les sérialiser.
+    """
+    if len(entries) < PARALLEL_STAT_THRESHOLD:
+        return [entry.stat() for entry in entries]
+    
+    with ThreadPoolExecutor(max_workers=PARALLEL_STAT_WORKERS) as pool:
+        return list(pool.map(lambda entry: entry.stat(), entries))
+
+
+def _try_stat(path: Path) -> Optional[os.stat_result]:
+    """os.lstat() en un seul appel système, ou None si le fichier n'existe pas."""
+    try:
+        return os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _rstrip_offset(fd: int, size: int, chunk: int = 4096) -> int:
+    """
+    Retourne la position juste après le dernier octet non-blanc du fichier.
+    Ne lit que la fin du fichier (par blocs de 4 KiB via pread).
+    """
+    end = size
+    while end > 0:
+        start = max(0, end - chunk)
+        tail = os.pread(fd, end - start, start).rstrip()
+        if tail:
+            return start + len(tail)
+        end = start
+    return 0
+
+
+def _section_header_re(section_clean: str) -> re.Pattern:
+    """
+    Regex du header d'une section (## Titre ou # Titre), compilée une fois par titre.
+    
+    Pattern corrigé v0.10.4 : accepte fin de ligne OU fin de fichier.
+    group(1) = début de ligne (préfixe), group(2) = le header qu'on veut garder.
+    """
+    pattern = _SECTION_HEADER_CACHE.get(section_clean)
+    if pattern is None:
+        if len(_SECTION_HEADER_CACHE) >= _SECTION_HEADER_CACHE_MAX:
+            _SECTION_HEADER_CACHE.clear()
+        pattern = re.compile(
+            rf'(^|\n)(#{{1,2}}\s*{re.escape(section_clean)}\s*$)',
+            re.MULTILINE | re.IGNORECASE
+        )
+        _SECTION_HEADER_CACHE[section_clean] = pattern
+    return pattern
+
+
 def _list_available_files() -> list[str]:
     """
     Liste tous les fichiers disponibles, y compris dans les sous-dossiers
@@ -91,40 +195,16 @@ def _list_available_files() -> list[str]:
     Returns:
         Liste des chemins relatifs des fichiers disponibles
     """
-    fichiers = []
-    
-    if not KNOWLEDGE_DIR.exists():
-        return fichiers
-    
-    # Parcourir récursivement avec suivi des liens symboliques
-    for root, dirs, files in os.walk(KNOWLEDGE_DIR, followlinks=True):
-        # Éviter les boucles infinies en excluant certains dossiers
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in {'__pycache__', 'venv'}]
-        
-        root_path = Path(root)
-        
-        for filename in files:
-            # Ignorer fichiers cachés
-            if filename.startswith('.'):
-                continue
-            
-            # Vérifier l'extension
-            ext = Path(filename).suffix.lower()
-            if ext not in SUPPORTED_EXTENSIONS:
-                continue
-            
-            try:
-                # Chemin relatif depuis KNOWLEDGE_DIR
-                rel_path = (root_path / filename).relative_to(KNOWLEDGE_DIR)
-                fichiers.append(str(rel_path))
-            except ValueError:
-                # Si relative_to échoue, utiliser le nom simple
-                fichiers.append(filename)
-    
-    return sorted(fichiers)
+    # Pas de cache : le mtime de KNOWLEDGE_DIR ne reflète pas les ajouts et
+    # suppressions dans les sous-dossiers parcourus
+    root = str(KNOWLEDGE_DIR)
+    return sorted(
+        os.path.relpath(entry.path, root)
+        for entry, _ in _iter_knowledge_entries(root)
+    )
 
 
-def read_knowledge(fichier: str) -> dict:
+def read_knowledge(fichier: str, lister_disponibles: bool = False) -> dict:
     """
     Lit un fichier de connaissance d'Iris.
     
@@ -135,32 +215,36 @@ def read_knowledge(fichier: str) -> dict:
     
     Args:
         fichier: Nom du fichier ou chemin relatif (avec ou sans extension)
+        lister_disponibles: Si True, joint la liste des fichiers disponibles
+                            en cas d'erreur (parcours de l'arborescence)
     
     Returns:
-        dict avec status, fichier, contenu (ou error + fichiers_disponibles)
+        dict avec status, fichier, contenu (ou error [+ fichiers_disponibles])
     """
     logger.info(f"📖 [KNOWLEDGE] Lecture: {fichier}")
     
     filepath, fichier_clean = _resolve_path(fichier)
     
     try:
-        if not filepath.exists():
-            # Lister les fichiers disponibles (y compris via symlinks)
-            fichiers_dispo = _list_available_files()
-            
-            return {
+        # Un seul stat : filepath est déjà résolu (liens symboliques suivis)
+        st = _try_stat(filepath)
+        if st is None or not stat_module.S_ISREG(st.st_mode):
+            erreur = {
                 "status": "error",
                 "error": f"Fichier '{fichier}' non trouvé",
-                "fichiers_disponibles": fichiers_dispo,
                 "chemin_verifie": str(filepath),
                 "hint": "Utilisez le chemin relatif (ex: drive_link/blackboard)"
             }
+            if lister_disponibles:
+                # Lister les fichiers disponibles (y compris via symlinks)
+                erreur["fichiers_disponibles"] = _list_available_files()
+            return erreur
         
         contenu = filepath.read_text(encoding='utf-8')
         
-        # Déterminer si c'est via un lien symbolique
-        original_path = KNOWLEDGE_DIR / fichier_clean
-        is_symlink = original_path.is_symlink() if original_path.exists() else False
+        # Via un lien symbolique si la résolution a quitté KNOWLEDGE_DIR
+        # (ex: drive_link → Google Drive) : aucun appel système nécessaire
+        is_symlink = not filepath.is_relative_to(KNOWLEDGE_DIR)
         
         return {
             "status": "success",
@@ -211,14 +295,24 @@ def append_knowledge(fichier: str, contenu: str) -> dict:
                 "fichiers_disponibles": fichiers_dispo
             }
         
-        # Lire le contenu actuel
-        contenu_actuel = filepath.read_text(encoding='utf-8')
-        
-        # Ajouter le nouveau contenu avec séparateur
-        nouveau_contenu = f"{contenu_actuel.rstrip()}\n\n{contenu.strip()}\n"
-        
-        # Écrire
-        filepath.write_text(nouveau_contenu, encoding='utf-8')
+        # Ajout en O(1) : on ne réécrit pas le fichier, on tronque seulement
+        # les blancs finaux puis on écrit le nouveau bloc en mode append
+        bloc = f"\n\n{contenu.strip()}\n".encode('utf-8')
+        
+        fd = os.open(filepath, os.O_RDWR | os.O_APPEND | os.O_CLOEXEC)
+        try:
+            size = os.fstat(fd).st_size
+            fin = _rstrip_offset(fd, size)
+            if fin < size:
+                os.ftruncate(fd, fin)
+            os.write(fd, bloc)
+            taille_finale = fin + len(bloc)
+            
+            # Ne pas garder le fichier entier en page cache après écriture
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
         
         logger.info(f"✅ [KNOWLEDGE] Ajouté {len(contenu)} chars à {fichier_clean}")
         
@@ -227,7 +321,7 @@ def append_knowledge(fichier: str, contenu: str) -> dict:
             "fichier": fichier_clean,
             "action": "append",
             "chars_ajoutes": len(contenu),
-            "taille_finale": len(nouveau_contenu),
+            "taille_finale": taille_finale,
             "message": f"Contenu ajouté à {fichier}"
         }
         
@@ -276,18 +370,11 @@ def update_knowledge(fichier: str, section: str, contenu: str) -> dict:
         # Chercher la section (## Titre ou # Titre)
         section_clean = section.strip()
         
-        # Pattern corrigé v0.10.4 :
-        # - {{1,2}} pour échapper les accolades dans la f-string
-        # - \s*$ pour accepter fin de ligne OU fin de fichier
-        # group(1) = ^ ou \n (préfixe)
-        # group(2) = ## Titre (le header qu'on veut garder)
-        pattern = rf'(^|\n)(#{{1,2}}\s*{re.escape(section_clean)}\s*$)'
-        match = re.search(pattern, texte, re.MULTILINE | re.IGNORECASE)
+        match = _section_header_re(section_clean).search(texte)
         
         if not match:
             # Extraire les sections existantes pour aider
-            sections_pattern = r'^#{1,2}\s*(.+?)\s*$'
-            sections_existantes = re.findall(sections_pattern, texte, re.MULTILINE)
+            sections_existantes = _SECTIONS_RE.findall(texte)
             
             return {
                 "status": "error",
@@ -299,10 +386,11 @@ def update_knowledge(fichier: str, section: str, contenu: str) -> dict:
         section_start = match.end()
         
         # Trouver où finit la section (prochain ## ou fin de fichier)
-        next_section = re.search(r'\n#{1,2}\s+\S', texte[section_start:])
+        # La recherche reprend à section_start : un seul passage sur le texte
+        next_section = _NEXT_SECTION_RE.search(texte, section_start)
         
         if next_section:
-            section_end = section_start + next_section.start()
+            section_end = next_section.start()
         else:
             section_end = len(texte)
         
@@ -471,38 +559,19 @@ def list_knowledge(include_subfolders: bool = True) -> dict:
         fichiers = []
         
         if include_subfolders:
-            # Parcours complet avec symlinks
-            for root, dirs, files in os.walk(KNOWLEDGE_DIR, followlinks=True):
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in {'__pycache__', 'venv'}]
-                
-                root_path = Path(root)
-                
-                for filename in files:
-                    if filename.startswith('.'):
-                        continue
-                    
-                    ext = Path(filename).suffix.lower()
-                    if ext not in SUPPORTED_EXTENSIONS:
-                        continue
-                    
-                    filepath = root_path / filename
-                    stat = filepath.stat()
-                    
-                    try:
-                        rel_path = filepath.relative_to(KNOWLEDGE_DIR)
-                    except ValueError:
-                        rel_path = Path(filename)
-                    
-                    # Détecter si via symlink
-                    is_symlink = any(part for part in rel_path.parts 
-                                    if (KNOWLEDGE_DIR / part).is_symlink())
-                    
-                    fichiers.append({
-                        "nom": str(rel_path),
-                        "taille": stat.st_size,
-                        "modifie": datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M'),
-                        "via_symlink": is_symlink
-                    })
+            # Parcours complet avec symlinks : énumération d'abord,
+            # puis un seul stat() par fichier, regroupés par lot
+            root = str(KNOWLEDGE_DIR)
+            found = list(_iter_knowledge_entries(root))
+            stats = _stat_entries([entry for entry, _ in found])
+            
+            for (entry, is_symlink), stat in zip(found, stats):
+                fichiers.append({
+                    "nom": os.path.relpath(entry.path, root),
+                    "taille": stat.st_size,
+                    "modifie": datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M'),
+                    "via_symlink": is_symlink
+                })
         else:
             # Seulement le niveau racine
             for f in sorted(KNOWLEDGE_DIR.glob("*.md")):
@@ -563,7 +632,7 @@ if __name__ == "__main__":
     drive_link = KNOWLEDGE_DIR / "drive_link"
     if drive_link.exists():
         print("\n3. Test read_knowledge('drive_link/blackboard'):")
-        result = read_knowledge("drive_link/blackboard")
+        result = read_knowledge("drive_link/blackboard", lister_disponibles=True)
         if result["status"] == "success":
             print(f"   ✅ Lu {result['taille']} caractères via symlink: {result.get('via_symlink')}")
         else:
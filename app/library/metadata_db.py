@@ -0,0 +1,55 @@
+"""
+metadata_db.py - Connexion partagée des bibliothèques à metadata.db
+
+Une connexion persistante par thread (évite connect/close à chaque appel),
+réglée une fois avec LIBRARY_PRAGMAS, et la détection paresseuse des index
+plein texte (FTS5) déclarés dans index/metadata_model.sql.
+"""
+
+import atexit
+import sqlite3
+import threading
+from config import METADATA_DB
+from utils.sqlite_tuning import tune_sqlite, LIBRARY_PRAGMAS
+
+
+_local = threading.local()
+
+
+def get_conn() -> sqlite3.Connection:
+    """Retourne la connexion SQLite du thread courant (créée et réglée une fois)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = tune_sqlite(sqlite3.connect(METADATA_DB, check_same_thread=False), LIBRARY_PRAGMAS)
+        atexit.register(conn.close)
+        _local.conn = conn
+    return conn
+
+
+class FtsProbe:
+    """
+    Détecte une seule fois par processus si une table FTS5 existe.
+    La table n'est jamais créée ici ; sans elle, l'appelant garde son LIKE.
+    """
+    
+    def __init__(self, table: str):
+        self.table = table
+        self.ready = False
+        self.available = False
+        self._lock = threading.Lock()
+    
+    def __call__(self, conn: sqlite3.Connection) -> bool:
+        if not self.ready:
+            with self._lock:
+                if not self.ready:
+                    try:
+                        exists = conn.execute(
+                            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+                            (self.table,)
+                        ).fetchone()
+                    except sqlite3.OperationalError:
+                        # Base occupée : nouvel essai au prochain appel, LIKE en attendant
+                        return False
+                    self.available = exists is not None
+                    self.ready = True
+        return self.available
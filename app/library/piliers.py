@@ -14,8 +14,73 @@ contrairement aux segments que le Scribe indexe passivement.
 Catégories: IDENTITE, RECHERCHE, TECHNIQUE, RELATION, VALEUR
 """
 
+import re
 import sqlite3
-from config import METADATA_DB
+from typing import Optional
+from library.metadata_db import get_conn, FtsProbe
+
+
+# Requêtes figées : le cache de statements de sqlite3 (clé = texte SQL)
+# les retrouve toujours, sans reconstruction de chaîne à chaque appel
+def _build_select(has_cat: bool, has_imp: bool) -> str:
+    conditions = []
+    if has_cat:
+        conditions.append("categorie = ?")
+    if has_imp:
+        conditions.append("importance >= ?")
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    return f"""
+        SELECT id, fait, categorie, importance, created_at
+        FROM piliers
+        {where_clause}
+        ORDER BY importance DESC, created_at DESC
+        LIMIT ?
+        """
+
+
+_STMTS = {
+    (has_cat, has_imp): _build_select(has_cat, has_imp)
+    for has_cat in (False, True)
+    for has_imp in (False, True)
+}
+_SQL_SIMILAR = "SELECT id, fait FROM piliers WHERE fait LIKE ? LIMIT 1"
+_SQL_SIMILAR_FTS = "SELECT rowid, fait FROM piliers_fts WHERE piliers_fts MATCH ? LIMIT 1"
+_TOKEN_RE = re.compile(r"\w+")
+_SQL_DELETE = "DELETE FROM piliers WHERE id = ? RETURNING fait"
+
+# UPDATE figés par combinaison (importance?, categorie?) : RETURNING fait
+# confirme l'existence dans le même aller-retour
+_SQL_UPDATE = {
+    (True, False): "UPDATE piliers SET importance = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? RETURNING fait",
+    (False, True): "UPDATE piliers SET categorie = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? RETURNING fait",
+    (True, True): "UPDATE piliers SET importance = ?, categorie = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ? RETURNING fait",
+}
+
+# Catégories valides (ordre d'affichage conservé pour les messages d'erreur)
+_CATEGORIES_ORDER = ("IDENTITE", "RECHERCHE", "TECHNIQUE", "RELATION", "VALEUR")
+_CATEGORIES = frozenset(_CATEGORIES_ORDER)
+_CATEGORIES_STR = ", ".join(_CATEGORIES_ORDER)
+
+# Étoiles précalculées par importance (0-3)
+_STARS = tuple("★" * i + "☆" * (3 - i) for i in range(4))
+
+# Index de tri (idx_piliers_sort, idx_piliers_rank) et index plein texte
+# piliers_fts (FTS5, contenu externe, détection de doublons) : déclarés dans
+# index/metadata_model.sql. Sans piliers_fts, on garde le LIKE.
+_piliers_fts = FtsProbe("piliers_fts")
+
+
+def _find_similar(cursor: sqlite3.Cursor, fait: str):
+    """
+    Cherche un pilier similaire : phrase FTS5 des ~5 premiers mots (ordre et
+    adjacence conservés, comme le LIKE), sinon LIKE.
+    """
+    tokens = _TOKEN_RE.findall(fait)[:5]
+    if tokens and _piliers_fts(cursor.connection):
+        cursor.execute(_SQL_SIMILAR_FTS, (f'"{" ".join(tokens)}"',))
+    else:
+        cursor.execute(_SQL_SIMILAR, (f"%{fait[:50]}%",))
+    return cursor.fetchone()
 
 
 def get_piliers(categorie: str = None, importance_min: int = None, limit: int = 10):
@@ -30,33 +95,18 @@ def get_piliers(categorie: str = None, importance_min: int = None, limit: int =
     Returns:
         str: Liste formatée des piliers pour l'Agent
     """
-    conn = sqlite3.connect(METADATA_DB)
+    conn = get_conn()
     cursor = conn.cursor()
     
     try:
-        conditions = []
         params = []
-        
         if categorie:
-            conditions.append("categorie = ?")
             params.append(categorie.upper())
-        
         if importance_min is not None:
-            conditions.append("importance >= ?")
             params.append(importance_min)
-        
-        where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
-        
-        query = f"""
-        SELECT id, fait, categorie, importance, created_at
-        FROM piliers
-        {where_clause}
-        ORDER BY importance DESC, created_at DESC
-        LIMIT ?
-        """
-        
         params.append(limit)
-        cursor.execute(query, params)
+        
+        cursor.execute(_STMTS[(bool(categorie), importance_min is not None)], params)
         results = cursor.fetchall()
         
         if not results:
@@ -65,76 +115,111 @@ def get_piliers(categorie: str = None, importance_min: int = None, limit: int =
             return "Aucun pilier consolidé pour le moment."
         
         # Formatage pour l'Agent
-        formatted = "=== PILIERS (FAITS CONSOLIDÉS) ===\n"
-        for id_, fait, cat, imp, created in results:
-            etoiles = "★" * imp + "☆" * (3 - imp)
-            formatted += f"[{cat}] {etoiles} {fait}\n"
+        lines = ["=== PILIERS (FAITS CONSOLIDÉS) ==="]
+        lines.extend(f"[{cat}] {_STARS[imp]} {fait}" for id_, fait, cat, imp, created in results)
+        lines.append("")
         
-        return formatted
+        return "\n".join(lines)
         
     except Exception as e:
         return f"Erreur bibliothèque piliers: {e}"
-    finally:
-        conn.close()
 
 
-def add_pilier(fait: str, categorie: str = "IDENTITE", importance: int = 1, source_id: int = None):
+def _validate_pilier(fait: str, categorie: str, importance: int):
+    """Retourne un message d'erreur, ou None si le pilier est valide."""
+    if categorie not in _CATEGORIES:
+        return f"Catégorie invalide. Choix: {_CATEGORIES_STR}"
+    
+    if not 0 <= importance <= 3:
+        return "Importance doit être entre 0 et 3."
+    
+    if not fait or len(fait.strip()) < 3:
+        return "Le fait doit contenir au moins 3 caractères."
+    
+    return None
+
+
+def add_piliers(faits: list[tuple[str, str, int, Optional[int]]]):
     """
-    Ajoute un nouveau pilier (fait consolidé par l'Agent).
+    Ajoute plusieurs piliers en une seule transaction (un seul commit).
     
     Args:
-        fait (str): Le fait à consolider (obligatoire)
-        categorie (str): IDENTITE, RECHERCHE, TECHNIQUE, RELATION, VALEUR (défaut: IDENTITE)
-        importance (int): 0-3 (défaut: 1)
-        source_id (int): ID du segment source (optionnel)
+        faits (list): Tuples (fait, categorie, importance, source_id)
     
     Returns:
-        str: Confirmation ou erreur
+        str: Une ligne de confirmation ou d'erreur par pilier
     """
-    # Validation
-    categories_valides = ["IDENTITE", "RECHERCHE", "TECHNIQUE", "RELATION", "VALEUR"]
-    categorie = categorie.upper()
+    messages = [None] * len(faits)
+    a_inserer = []  # (index, fait, categorie, importance, source_id)
     
-    if categorie not in categories_valides:
-        return f"Catégorie invalide. Choix: {', '.join(categories_valides)}"
+    # Validation en Python avant tout accès à la base
+    for i, (fait, categorie, importance, source_id) in enumerate(faits):
+        categorie = (categorie or "IDENTITE").upper()
+        erreur = _validate_pilier(fait, categorie, importance)
+        if erreur:
+            messages[i] = erreur
+        else:
+            a_inserer.append((i, fait, categorie, importance, source_id))
     
-    if not 0 <= importance <= 3:
-        return "Importance doit être entre 0 et 3."
+    if not a_inserer:
+        return "\n".join(messages)
     
-    if not fait or len(fait.strip()) < 3:
-        return "Le fait doit contenir au moins 3 caractères."
-    
-    conn = sqlite3.connect(METADATA_DB)
+    conn = get_conn()
     cursor = conn.cursor()
     
     try:
-        # Vérifier si un pilier similaire existe déjà
-        cursor.execute(
-            "SELECT id, fait FROM piliers WHERE fait LIKE ? LIMIT 1",
-            (f"%{fait[:50]}%",)
-        )
-        existing = cursor.fetchone()
+        # Vérifier si un pilier similaire existe déjà (base ou même lot)
+        rows = []
+        retenus = []
+        for i, fait, categorie, importance, source_id in a_inserer:
+            existing = _find_similar(cursor, fait)
+            if not existing:
+                existing = next(((None, r[0]) for r in rows if fait[:50] in r[0]), None)
+            
+            if existing:
+                ref = f"ID {existing[0]}" if existing[0] is not None else "même lot"
+                messages[i] = f"Pilier similaire existe déjà ({ref}): {existing[1][:80]}..."
+                continue
+            
+            rows.append((fait.strip(), categorie, importance, source_id))
+            retenus.append((i, fait, categorie, importance))
         
-        if existing:
-            return f"Pilier similaire existe déjà (ID {existing[0]}): {existing[1][:80]}..."
+        if rows:
+            # Insertion groupée
+            cursor.executemany("""
+                INSERT INTO piliers (fait, categorie, importance, source_id)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            
+            # AUTOINCREMENT dans une même transaction : IDs consécutifs
+            dernier_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            conn.commit()
+            
+            premier_id = dernier_id - len(rows) + 1
+            for offset, (i, fait, categorie, importance) in enumerate(retenus):
+                messages[i] = f"✅ Pilier consolidé (ID {premier_id + offset}): [{categorie}] {_STARS[importance]} {fait}"
         
-        # Insertion
-        cursor.execute("""
-            INSERT INTO piliers (fait, categorie, importance, source_id)
-            VALUES (?, ?, ?, ?)
-        """, (fait.strip(), categorie, importance, source_id))
-        
-        conn.commit()
-        pilier_id = cursor.lastrowid
-        
-        etoiles = "★" * importance + "☆" * (3 - importance)
-        return f"✅ Pilier consolidé (ID {pilier_id}): [{categorie}] {etoiles} {fait}"
+        return "\n".join(messages)
         
     except Exception as e:
         conn.rollback()
         return f"Erreur ajout pilier: {e}"
-    finally:
-        conn.close()
+
+
+def add_pilier(fait: str, categorie: str = "IDENTITE", importance: int = 1, source_id: int = None):
+    """
+    Ajoute un nouveau pilier (fait consolidé par l'Agent).
+    
+    Args:
+        fait (str): Le fait à consolider (obligatoire)
+        categorie (str): IDENTITE, RECHERCHE, TECHNIQUE, RELATION, VALEUR (défaut: IDENTITE)
+        importance (int): 0-3 (défaut: 1)
+        source_id (int): ID du segment source (optionnel)
+    
+    Returns:
+        str: Confirmation ou erreur
+    """
+    return add_piliers([(fait, categorie, importance, source_id)])
 
 
 def update_pilier(pilier_id: int, importance: int = None, categorie: str = None):
@@ -152,48 +237,37 @@ def update_pilier(pilier_id: int, importance: int = None, categorie: str = None)
     if importance is None and categorie is None:
         return "Rien à modifier. Spécifie importance et/ou categorie."
     
-    conn = sqlite3.connect(METADATA_DB)
+    conn = get_conn()
     cursor = conn.cursor()
     
     try:
-        # Vérifier que le pilier existe
-        cursor.execute("SELECT fait FROM piliers WHERE id = ?", (pilier_id,))
-        existing = cursor.fetchone()
-        
-        if not existing:
-            return f"Pilier ID {pilier_id} introuvable."
-        
-        updates = []
         params = []
         
         if importance is not None:
             if not 0 <= importance <= 3:
                 return "Importance doit être entre 0 et 3."
-            updates.append("importance = ?")
             params.append(importance)
         
         if categorie is not None:
-            categories_valides = ["IDENTITE", "RECHERCHE", "TECHNIQUE", "RELATION", "VALEUR"]
             categorie = categorie.upper()
-            if categorie not in categories_valides:
-                return f"Catégorie invalide. Choix: {', '.join(categories_valides)}"
-            updates.append("categorie = ?")
+            if categorie not in _CATEGORIES:
+                return f"Catégorie invalide. Choix: {_CATEGORIES_STR}"
             params.append(categorie)
         
-        updates.append("updated_at = CURRENT_TIMESTAMP")
         params.append(pilier_id)
         
-        query = f"UPDATE piliers SET {', '.join(updates)} WHERE id = ?"
-        cursor.execute(query, params)
+        cursor.execute(_SQL_UPDATE[(importance is not None, categorie is not None)], params)
+        existing = cursor.fetchone()
         conn.commit()
         
+        if not existing:
+            return f"Pilier ID {pilier_id} introuvable."
+        
         return f"✅ Pilier ID {pilier_id} mis à jour: {existing[0][:60]}..."
         
     except Exception as e:
         conn.rollback()
         return f"Erreur mise à jour pilier: {e}"
-    finally:
-        conn.close()
 
 
 def delete_pilier(pilier_id: int):
@@ -206,23 +280,20 @@ def delete_pilier(pilier_id: int):
     Returns:
         str: Confirmation ou erreur
     """
-    conn = sqlite3.connect(METADATA_DB)
+    conn = get_conn()
     cursor = conn.cursor()
     
     try:
-        cursor.execute("SELECT fait FROM piliers WHERE id = ?", (pilier_id,))
+        # RETURNING : existence + suppression en un seul aller-retour
+        cursor.execute(_SQL_DELETE, (pilier_id,))
         existing = cursor.fetchone()
+        conn.commit()
         
         if not existing:
             return f"Pilier ID {pilier_id} introuvable."
         
-        cursor.execute("DELETE FROM piliers WHERE id = ?", (pilier_id,))
-        conn.commit()
-        
         return f"🗑️ Pilier supprimé: {existing[0][:60]}..."
         
     except Exception as e:
         conn.rollback()
-        return f"Erreur suppression pilier: {e}"
-    finally:
-        conn.close()
\ No newline at end of file
+        return f"Erreur suppression pilier: {e}"
\ No newline at end of file
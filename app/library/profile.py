@@ -9,17 +9,65 @@ Permet à l'Agent (Iris) de consulter le profil détaillé de Serge
 from pathlib import Path
 import json
 import logging
+from typing import Dict, Optional, Tuple
+
+# Optionnel: orjson (C) pour le chargement et l'indentation du profil
+try:
+    import orjson
+    
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    
+    _loads = json.loads
 
 logger = logging.getLogger(__name__)
 
 # Chemin vers le profil
 PROFILE_PATH = Path.home() / "Dropbox" / "aiterego_memory" / "config" / "profil_serge.json"
 
+# Sections exposées → clés du JSON
+SECTION_MAP = {
+    "identity": "identity_core",
+    "cognitive": "cognitive_operating_system",
+    "biological": "biological_hardware",
+    "knowledge": "knowledge_graph",
+    "interaction": "interaction_protocol",
+    "biography": "biography"
+}
+
+# Cache des textes formatés : section (None = complet) → (mtime_ns, texte)
+_CACHE: Dict[Optional[str], Tuple[int, str]] = {}
+
+
+def _format_profile(user_profile: dict, mtime_ns: int) -> Dict[Optional[str], Tuple[int, str]]:
+    """
+    Formate en une passe le profil complet et toutes les sections.
+    
+    Le nouveau cache est construit à part puis publié en une seule affectation :
+    un lecteur concurrent voit l'ancien dict ou le nouveau, jamais un dict vidé.
+    """
+    global _CACHE
+    cache = {None: (mtime_ns, f"=== PROFIL COMPLET DE SERGE ===\n{_dumps(user_profile)}")}
+    
+    for name, key in SECTION_MAP.items():
+        if key in user_profile:
+            cache[name] = (mtime_ns, f"=== PROFIL SERGE : {name.upper()} ===\n{_dumps(user_profile[key])}")
+    
+    _CACHE = cache
+    return cache
+
 
 def read_profile(section: str = None) -> str:
     """
     Lit le profil de Serge.
     
+    Le fichier n'est relu et reformaté que si sa date de modification change.
+    
     Args:
         section (str, optionnel): Section spécifique à retourner.
             Options: identity, cognitive, biological, knowledge, interaction, biography
@@ -31,34 +79,25 @@ def read_profile(section: str = None) -> str:
     logger.info(f"📋 Lecture profil (section: {section or 'complète'})")
     
     try:
-        if not PROFILE_PATH.exists():
+        try:
+            mtime_ns = PROFILE_PATH.stat().st_mtime_ns
+        except FileNotFoundError:
             return f"Erreur: Fichier profil non trouvé: {PROFILE_PATH}"
         
-        with open(PROFILE_PATH, 'r', encoding='utf-8') as f:
-            profile = json.load(f)
+        cache_key = section.lower() if section else None
         
-        user_profile = profile.get("user_profile", {})
+        # Recharger seulement si le fichier a changé (même dict pour test et lecture)
+        cache = _CACHE
+        if cache.get(None, (None,))[0] != mtime_ns:
+            profile = _loads(PROFILE_PATH.read_bytes())
+            cache = _format_profile(profile.get("user_profile", {}), mtime_ns)
         
-        # Si section spécifique demandée
-        if section:
-            section_map = {
-                "identity": "identity_core",
-                "cognitive": "cognitive_operating_system",
-                "biological": "biological_hardware",
-                "knowledge": "knowledge_graph",
-                "interaction": "interaction_protocol",
-                "biography": "biography"
-            }
-            
-            key = section_map.get(section.lower())
-            if key and key in user_profile:
-                return f"=== PROFIL SERGE : {section.upper()} ===\n{json.dumps(user_profile[key], indent=2, ensure_ascii=False)}"
-            else:
-                sections_dispo = ", ".join(section_map.keys())
-                return f"Section '{section}' non trouvée. Sections disponibles: {sections_dispo}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached[1]
         
-        # Sinon retourner tout le profil formaté
-        return f"=== PROFIL COMPLET DE SERGE ===\n{json.dumps(user_profile, indent=2, ensure_ascii=False)}"
+        sections_dispo = ", ".join(SECTION_MAP.keys())
+        return f"Section '{section}' non trouvée. Sections disponibles: {sections_dispo}"
         
     except json.JSONDecodeError as e:
         return f"Erreur parsing JSON du profil: {e}"
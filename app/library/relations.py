@@ -1,23 +1,46 @@
-import sqlite3
-from config import METADATA_DB
+import re
+from library.metadata_db import get_conn, FtsProbe
 
-def get_relation_history(person_name: str, limit: int = 10):
-    """
-    Rayon Relations : Retrace l'historique avec une personne.
-    """
-    conn = sqlite3.connect(METADATA_DB)
-    cursor = conn.cursor()
-    
-    query = """
+
+_SQL_HISTORY_LIKE = """
     SELECT m.timestamp, m.resume_texte, m.projets
     FROM metadata m
     WHERE m.personnes LIKE ?
     ORDER BY m.timestamp ASC
     LIMIT ?
     """
+_SQL_HISTORY_FTS = """
+    SELECT m.timestamp, m.resume_texte, m.projets
+    FROM metadata m
+    WHERE m.id IN (
+        SELECT rowid FROM metadata_personnes_fts WHERE metadata_personnes_fts MATCH ?
+    )
+    ORDER BY m.timestamp ASC
+    LIMIT ?
+    """
+_TOKEN_RE = re.compile(r"\w+")
+
+# Index plein texte (FTS5, contenu externe) sur metadata.personnes :
+# index inversé → O(termes) au lieu d'un LIKE '%...%' sur toute la table.
+# Table et triggers déclarés dans index/metadata_model.sql ; sans la table, on garde le LIKE.
+_personnes_fts = FtsProbe("metadata_personnes_fts")
+
+
+def get_relation_history(person_name: str, limit: int = 10):
+    """
+    Rayon Relations : Retrace l'historique avec une personne.
+    """
+    conn = get_conn()
+    cursor = conn.cursor()
     
     try:
-        cursor.execute(query, (f"%{person_name}%", limit))
+        # Phrase FTS5 avec préfixe sur le dernier mot ("Jean Fr" → Jean François)
+        tokens = _TOKEN_RE.findall(person_name)
+        if tokens and _personnes_fts(conn):
+            phrase = " ".join(tokens)
+            cursor.execute(_SQL_HISTORY_FTS, (f'"{phrase}" *', limit))
+        else:
+            cursor.execute(_SQL_HISTORY_LIKE, (f"%{person_name}%", limit))
         results = cursor.fetchall()
         
         if not results:
@@ -29,6 +52,4 @@ def get_relation_history(person_name: str, limit: int = 10):
         return formatted
         
     except Exception as e:
-        return f"Erreur bibliothèque relations: {e}"
-    finally:
-        conn.close()
\ No newline at end of file
+        return f"Erreur bibliothèque relations: {e}"
\ No newline at end of file
@@ -15,10 +15,16 @@ Usage dans la cascade de recherche:
 
 import os
 import re
+import mmap
+import time
 import logging
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -26,18 +32,61 @@ logger = logging.getLogger(__name__)
 ECHANGES_PATH = Path.home() / "Dropbox" / "aiterego_memory" / "echanges"
 DEFAULT_CONTEXT_CHARS = 500  # Caractères à extraire autour du match
 MAX_RESULTS = 10  # Maximum de passages à retourner
+SCAN_WORKERS = min(8, os.cpu_count() or 1)  # Threads de scan (IO-bound)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_query(query: str) -> "re.Pattern[bytes]":
+    """
+    Compile la requête en regex sur octets UTF-8, insensible à la casse.
+    
+    re.IGNORECASE ne replie que l'ASCII sur des bytes: les lettres accentuées
+    (é/É, à/À...) reçoivent donc une alternative explicite minuscule|majuscule.
+    """
+    parts = []
+    for ch in query:
+        if ch.isascii():
+            parts.append(re.escape(ch).encode('utf-8'))
+        else:
+            variants = {ch, ch.lower(), ch.upper()}
+            alts = b"|".join(re.escape(v.encode('utf-8')) for v in sorted(variants))
+            parts.append(b"(?:" + alts + b")")
+    return re.compile(b"".join(parts), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=64)
+def _probe_variants(query: str) -> tuple:
+    """
+    Variantes de casse usuelles de la requête, en octets, pour le pré-filtre.
+    
+    mm.find() (memmem en C) élimine les fichiers sans match bien plus vite
+    que le moteur regex. Une occurrence dont la casse ne correspond à
+    aucune variante (ex: "iPhone" pour "iphone") n'est pas détectée.
+    """
+    variants = dict.fromkeys((query, query.lower(), query.upper(),
+                              query.capitalize(), query.title()))
+    return tuple(v.encode('utf-8') for v in variants)
 
 
 def get_recent_files(scope: str = "all") -> List[Path]:
     """
     Récupère les fichiers .txt selon la portée temporelle.
     
+    Le parcours est mis en cache par tranche d'une minute: une rafale de
+    recherches enchaînées ne refait pas le walk du disque.
+    
     Args:
         scope: 'today' | 'week' | 'month' | 'year' | 'all' (défaut: 'all')
     
     Returns:
         Liste de chemins de fichiers, triés du plus récent au plus ancien
     """
+    return list(_list_files_for_scope(scope, int(time.time() // 60)))
+
+
+@functools.lru_cache(maxsize=8)
+def _list_files_for_scope(scope: str, minute_bucket: int) -> Tuple[Path, ...]:
+    """Parcours echanges/YYYY/MM/*.txt (minute_bucket sert de clé d'invalidation)."""
     now = datetime.now()
     
     # Calculer la date limite selon la portée
@@ -55,78 +104,157 @@ def get_recent_files(scope: str = "all") -> List[Path]:
         # Par défaut: semaine
         cutoff = now - timedelta(days=7)
     
+    # Comparaison par tuple (y, m, d) plutôt que strptime
+    cutoff_key = (cutoff.year, cutoff.month, cutoff.day)
+    
     files = []
     
     # Parcourir la structure echanges/YYYY/MM/*.txt
     if not ECHANGES_PATH.exists():
         logger.warning(f"Dossier echanges introuvable: {ECHANGES_PATH}")
-        return files
-    
-    for year_dir in ECHANGES_PATH.iterdir():
-        if not year_dir.is_dir() or not year_dir.name.isdigit():
-            continue
+        return ()
+    
+    # Élagage par nom de dossier: du plus récent au plus ancien, on arrête
+    # dès qu'une année (ou un mois) tombe sous la date limite
+    cutoff_ym = (cutoff.year, cutoff.month)
+    year_dirs = sorted(
+        (e for e in os.scandir(ECHANGES_PATH) if e.name.isdigit() and e.is_dir()),
+        key=lambda e: int(e.name), reverse=True
+    )
+    
+    for year_dir in year_dirs:
+        year = int(year_dir.name)
+        if year < cutoff.year:
+            break
         
-        for month_dir in year_dir.iterdir():
+        for month_dir in os.scandir(year_dir.path):
             if not month_dir.is_dir():
                 continue
+            if month_dir.name.isdigit() and (year, int(month_dir.name)) < cutoff_ym:
+                continue
             
-            for txt_file in month_dir.glob("*.txt"):
-                # Extraire la date du nom de fichier (format: YYYY-MM-DDTHH-MM-SS.txt)
-                try:
-                    date_str = txt_file.stem[:10]  # YYYY-MM-DD
-                    file_date = datetime.strptime(date_str, "%Y-%m-%d")
+            with os.scandir(month_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.endswith(".txt"):
+                        continue
+                    # Extraire la date du nom de fichier (format: YYYY-MM-DDTHH-MM-SS.txt)
+                    try:
+                        file_key = (int(name[:4]), int(name[5:7]), int(name[8:10]))
+                    except ValueError:
+                        # Nom de fichier non standard, ignorer
+                        continue
                     
-                    if file_date >= cutoff:
-                        files.append(txt_file)
-                except (ValueError, IndexError):
-                    # Nom de fichier non standard, ignorer
-                    continue
+                    if file_key >= cutoff_key:
+                        files.append(Path(entry.path))
     
     # Trier du plus récent au plus ancien
     files.sort(key=lambda f: f.name, reverse=True)
     
-    return files
+    return tuple(files)
 
 
-def extract_context(text: str, match_start: int, match_end: int, context_chars: int = DEFAULT_CONTEXT_CHARS) -> str:
+def extract_context(mm: mmap.mmap, match_start: int, match_end: int, context_chars: int = DEFAULT_CONTEXT_CHARS) -> str:
     """
     Extrait le contexte autour d'un match, en essayant de couper aux limites de phrases.
     
     Args:
-        text: Texte complet
-        match_start: Position de début du match
-        match_end: Position de fin du match
+        mm: Contenu du fichier (mmap, octets)
+        match_start: Position (octets) de début du match
+        match_end: Position (octets) de fin du match
         context_chars: Nombre de caractères de contexte de chaque côté
     
     Returns:
-        Passage extrait avec le match en contexte
+        Passage extrait avec le match en contexte (seule cette tranche est décodée)
     """
+    size = len(mm)
+    
     # Calculer les bornes brutes
     start = max(0, match_start - context_chars)
-    end = min(len(text), match_end + context_chars)
+    end = min(size, match_end + context_chars)
     
     # Essayer de trouver le début d'une ligne/phrase
     if start > 0:
         # Chercher un saut de ligne ou un timestamp
-        newline_pos = text.rfind('\n', start - 100, match_start)
+        newline_pos = mm.rfind(b'\n', max(0, start - 100), match_start)
         if newline_pos > start - 100:
             start = newline_pos + 1
     
     # Essayer de trouver la fin d'une ligne/phrase
-    if end < len(text):
-        newline_pos = text.find('\n', match_end, end + 100)
+    if end < size:
+        newline_pos = mm.find(b'\n', match_end, end + 100)
         if newline_pos != -1 and newline_pos < end + 100:
             end = newline_pos
     
-    passage = text[start:end].strip()
+    # Recaler les bornes brutes sur des débuts de caractères UTF-8
+    # (octets de continuation 10xxxxxx) pour ne pas produire de U+FFFD
+    while 0 < start < match_start and mm[start] & 0xC0 == 0x80:
+        start += 1
+    while match_end < end < size and mm[end] & 0xC0 == 0x80:
+        end -= 1
+    
+    # Décoder seulement la tranche extraite
+    passage = mm[start:end].decode('utf-8', errors='replace').strip()
     
     # Ajouter des indicateurs de troncature
     prefix = "..." if start > 0 else ""
-    suffix = "..." if end < len(text) else ""
+    suffix = "..." if end < size else ""
     
     return f"{prefix}{passage}{suffix}"
 
 
+def _scan_one(file_path: Path, pattern: "re.Pattern[bytes]", probes: tuple,
+              context_chars: int) -> Tuple[int, int, List[dict]]:
+    """
+    Scanne un fichier. Retourne (scanné 0/1, nb de matches, passages).
+    
+    Au plus MAX_RESULTS passages sont extraits; les matches au-delà sont
+    seulement comptés.
+    """
+    passages = []
+    matches = 0
+    try:
+        # Lecture du fichier (LECTURE SEULE) via mmap: le noyau pagine,
+        # pas de copie ni de décodage UTF-8 du fichier entier
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 1, 0, passages
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Pré-filtre: la plupart des fichiers n'ont aucun match
+                if not any(mm.find(p) >= 0 for p in probes):
+                    return 1, 0, passages
+                
+                # Extraire la date du fichier
+                date_str = file_path.stem[:10]
+                
+                # Trouver tous les matches
+                for match in pattern.finditer(mm):
+                    matches += 1
+                    
+                    if len(passages) >= MAX_RESULTS:
+                        continue
+                    
+                    # Extraire le contexte autour du match
+                    passage = extract_context(
+                        mm, 
+                        match.start(), 
+                        match.end(), 
+                        context_chars
+                    )
+                    
+                    passages.append({
+                        "date": date_str,
+                        "file": file_path.name,
+                        "passage": passage
+                    })
+    except Exception as e:
+        logger.error(f"Erreur lecture {file_path}: {e}")
+        return 0, 0, []
+    
+    return 1, matches, passages
+
+
 def search_recent_files(query: str, scope: str = "all", context_chars: int = DEFAULT_CONTEXT_CHARS) -> str:
     """
     Scan textuel des fichiers de conversation.
@@ -156,51 +284,37 @@ def search_recent_files(query: str, scope: str = "all", context_chars: int = DEF
     if not files:
         return f"Aucun fichier trouvé pour la portée '{scope}'. Passage à Hermès recommandé."
     
-    # Préparer la recherche (insensible à la casse)
-    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    # Préparer la recherche (insensible à la casse, sur les octets bruts)
+    pattern = _compile_query(query)
+    probes = _probe_variants(query)
     
     results = []
     files_scanned = 0
     total_matches = 0
     
-    for file_path in files:
-        try:
-            # Lecture du fichier (LECTURE SEULE)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            files_scanned += 1
-            
-            # Trouver tous les matches
-            for match in pattern.finditer(content):
-                total_matches += 1
-                
-                if len(results) >= MAX_RESULTS:
-                    break
-                
-                # Extraire le contexte autour du match
-                passage = extract_context(
-                    content, 
-                    match.start(), 
-                    match.end(), 
-                    context_chars
-                )
-                
-                # Extraire la date du fichier
-                date_str = file_path.stem[:10]
-                
-                results.append({
-                    "date": date_str,
-                    "file": file_path.name,
-                    "passage": passage
-                })
+    # Scan parallèle (IO-bound: mmap + memmem relâchent le GIL). Les futures
+    # sont consommées dans l'ordre des fichiers (plus récent d'abord) et la
+    # fenêtre de soumission est bornée pour s'arrêter tôt une fois plein.
+    pending = deque()
+    file_iter = iter(files)
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        for file_path in islice(file_iter, SCAN_WORKERS * 2):
+            pending.append(executor.submit(_scan_one, file_path, pattern, probes, context_chars))
+        
+        while pending:
+            scanned, matches, passages = pending.popleft().result()
+            files_scanned += scanned
+            total_matches += matches
+            results.extend(passages[:MAX_RESULTS - len(results)])
             
             if len(results) >= MAX_RESULTS:
+                for future in pending:
+                    future.cancel()
                 break
-                
-        except Exception as e:
-            logger.error(f"Erreur lecture {file_path}: {e}")
-            continue
+            
+            next_path = next(file_iter, None)
+            if next_path is not None:
+                pending.append(executor.submit(_scan_one, next_path, pattern, probes, context_chars))
     
     # Formater la sortie
     if not results:
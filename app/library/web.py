@@ -15,6 +15,7 @@ Usage:
 import os
 import logging
 from pathlib import Path
+from typing import Iterator
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement
@@ -29,69 +30,109 @@ logger = logging.getLogger(__name__)
 # Configuration
 SEARCH_MODEL = "gemini-3-flash-preview"  # Modèle pour les recherches web
 
+# Configuration avec grounding forcé (immuable, partagée entre les appels)
+SEARCH_CONFIG = types.GenerateContentConfig(
+    system_instruction="Tu es un assistant de recherche. Réponds de façon concise et factuelle en français. Cite tes sources.",
+    temperature=0.7,
+    max_output_tokens=2048,
+    tools=[types.Tool(google_search=types.GoogleSearch())]
+)
+
+# Client Gemini réutilisé (pool de connexions HTTP conservé entre les recherches)
+_CLIENT = None
+
+
+def _get_client(api_key: str):
+    """Retourne le client Gemini du processus, créé au premier appel."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = genai.Client(api_key=api_key)
+    return _CLIENT
+
+
+def _format_sources(grounding, limit: int) -> list:
+    """Sources web (titre + URI) des métadonnées de grounding, en une passe."""
+    chunks = getattr(grounding, 'grounding_chunks', None) or []
+    return [
+        f"• {chunk.web.title}\n  {chunk.web.uri}"
+        for chunk in chunks[:limit]
+        if getattr(chunk, 'web', None) and hasattr(chunk.web, 'uri') and hasattr(chunk.web, 'title')
+    ]
+
+
+def search_web_stream(query: str, limit: int = 5) -> Iterator[str]:
+    """
+    Recherche web en streaming : produit l'en-tête, puis le texte au fil
+    des morceaux reçus de Gemini, puis le bloc des sources.
+    
+    Les exceptions de l'API remontent à l'appelant.
+    
+    Args:
+        query: La question ou recherche à effectuer
+        limit: Nombre maximum de sources (0 = pas de sources)
+        
+    Yields:
+        Fragments de texte formaté
+    """
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("Clé API Gemini non configurée")
+    
+    client = _get_client(api_key)
+    
+    # Prompt optimisé pour la recherche
+    search_prompt = f"Recherche des informations actuelles et fiables sur: {query}"
+    
+    yield f"📡 RÉSULTATS WEB pour: {query}\n\n"
+    
+    grounding = None
+    has_text = False
+    for chunk in client.models.generate_content_stream(
+        model=SEARCH_MODEL,
+        contents=search_prompt,
+        config=SEARCH_CONFIG
+    ):
+        if chunk.text:
+            has_text = True
+            yield chunk.text
+        
+        # Les métadonnées de grounding arrivent avec les derniers morceaux
+        if limit > 0 and chunk.candidates:
+            metadata = getattr(chunk.candidates[0], 'grounding_metadata', None)
+            if metadata:
+                grounding = metadata
+    
+    if not has_text:
+        yield "Aucun résultat trouvé."
+    
+    sources = _format_sources(grounding, limit) if grounding else []
+    if sources:
+        yield "\n\n📚 SOURCES:\n" + "\n".join(sources)
+    
+    logger.info(f"✅ Recherche web terminée: {len(sources)} sources trouvées")
+
 
 def search_web(query: str, limit: int = 5) -> str:
     """
     Recherche web explicite via Gemini + Google Search.
     Force le grounding pour obtenir des informations actuelles.
     
+    Version bloquante de search_web_stream (fragments joints).
+    
     Args:
         query: La question ou recherche à effectuer
-        limit: Nombre maximum de sources à retourner (défaut: 5)
+        limit: Nombre maximum de sources à retourner (défaut: 5, 0 = aucune)
         
     Returns:
         Texte formaté avec la réponse et les sources
     """
     logger.info(f"🌐 Recherche web: {query}")
     
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
+    if not os.getenv("GEMINI_API_KEY"):
         return "Erreur: Clé API Gemini non configurée"
     
     try:
-        client = genai.Client(api_key=api_key)
-        
-        # Configuration avec grounding forcé
-        config = types.GenerateContentConfig(
-            system_instruction="Tu es un assistant de recherche. Réponds de façon concise et factuelle en français. Cite tes sources.",
-            temperature=0.7,
-            max_output_tokens=2048,
-            tools=[types.Tool(google_search=types.GoogleSearch())]
-        )
-        
-        # Prompt optimisé pour la recherche
-        search_prompt = f"Recherche des informations actuelles et fiables sur: {query}"
-        
-        response = client.models.generate_content(
-            model=SEARCH_MODEL,
-            contents=search_prompt,
-            config=config
-        )
-        
-        # Extraire le texte
-        result_text = response.text if response.text else "Aucun résultat trouvé."
-        
-        # Extraire et formater les sources
-        sources = []
-        if hasattr(response, 'candidates') and response.candidates:
-            candidate = response.candidates[0]
-            if hasattr(candidate, 'grounding_metadata') and candidate.grounding_metadata:
-                grounding = candidate.grounding_metadata
-                if hasattr(grounding, 'grounding_chunks') and grounding.grounding_chunks:
-                    for chunk in grounding.grounding_chunks[:limit]:
-                        if hasattr(chunk, 'web') and chunk.web:
-                            web = chunk.web
-                            if hasattr(web, 'uri') and hasattr(web, 'title'):
-                                sources.append(f"• {web.title}\n  {web.uri}")
-        
-        # Formater la réponse finale
-        formatted_result = f"📡 RÉSULTATS WEB pour: {query}\n\n{result_text}"
-        
-        if sources:
-            formatted_result += "\n\n📚 SOURCES:\n" + "\n".join(sources)
-        
-        logger.info(f"✅ Recherche web terminée: {len(sources)} sources trouvées")
-        return formatted_result
+        return "".join(search_web_stream(query, limit))
         
     except Exception as e:
         error_msg = f"Erreur recherche web: {str(e)}"
@@ -13,21 +13,39 @@ CHANGELOG v0.10.2:
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
+from typing import Optional, Union
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from queue import SimpleQueue
 import asyncio
+import atexit
 import re
 import json
 import threading
+import time
+
+# Optionnel: orjson (C) pour le décodage des appels d'outils
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optionnel: msgspec (décodage typé {"tool": ..., "args": {...}} en C)
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
 # Configuration
 from config import HOST, PORT, DATA_DIR, BUFFER_DIR, ECHANGES_DIR
 from utils.context_window import (
     count_tokens, should_rotate, rotate_window, 
     get_window_status, validate_input_size, 
-    process_large_input, initialize_window, THRESHOLD, MAX_INPUT
+    process_large_input, initialize_window, atomic_write_text, THRESHOLD, MAX_INPUT
 )
 
 # Providers et Agents
@@ -40,6 +58,8 @@ from actions.hermes_wrapper import dispatch_tool
 
 # === CONFIGURATION ===
 MAX_TOOL_CHAIN = 5  # Nombre max d'appels d'outils consécutifs
+SCRIBE_WORKERS = 2  # Workers Scribe temps réel persistants
+SCRIBE_QUEUE_SIZE = 64  # File bornée (au-delà: segment temps réel ignoré)
 
 # === CONFIGURATION LOGS ===
 
@@ -52,6 +72,18 @@ class HealthCheckFilter(logging.Filter):
     def filter(self, record: logging.LogRecord) -> bool:
         return "/health" not in record.getMessage()
 
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler sans stat() par enregistrement (correctif CPython gh-105623).
+    Tant que la taille prévue reste sous maxBytes, pas de rotation à vérifier.
+    """
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0 and self.stream.tell() + len(self.format(record)) + 1 < self.maxBytes:
+            return False
+        return super().shouldRollover(record)
+
 # Format des logs
 log_format = "%(asctime)s [%(name)s] %(levelname)s: %(message)s"
 date_format = "%Y-%m-%d %H:%M:%S"
@@ -67,17 +99,23 @@ root_logger.handlers.clear()
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(logging.Formatter(log_format, date_format))
 console_handler.addFilter(HealthCheckFilter())
-root_logger.addHandler(console_handler)
 
 # Handler FICHIER (avec tout, y compris /health pour audit)
 log_file = LOGS_DIR / f"moss_{datetime.now().strftime('%Y-%m-%d')}.log"
-file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=10)
+file_handler = FastRotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=10)
 file_handler.setFormatter(logging.Formatter(log_format, date_format))
-root_logger.addHandler(file_handler)
 
-# Forcer tous les loggers à utiliser notre handler fichier
-for logger_name in ['uvicorn', 'uvicorn.access', 'uvicorn.error', 'httpx', 'google_genai', 'google_genai.models', 'google_genai.types', '__main__', 'utils.trildasa_engine']:
-    logging.getLogger(logger_name).addHandler(file_handler)
+# Écriture + rotation dans un thread dédié : la requête ne fait qu'enfiler
+_log_queue = SimpleQueue()
+root_logger.addHandler(QueueHandler(_log_queue))
+_log_listener = QueueListener(_log_queue, console_handler, file_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Les loggers nommés (httpx, google_genai, uvicorn...) propagent vers la
+# racine : pas de handler fichier par logger, sinon chaque ligne est écrite
+# plusieurs fois. uvicorn est lancé avec log_config=None pour qu'il garde
+# la propagation au lieu d'installer ses propres handlers.
 
 # Appliquer le filtre au logger Uvicorn aussi
 logging.getLogger("uvicorn.access").addFilter(HealthCheckFilter())
@@ -93,26 +131,99 @@ gemini = GeminiProvider()
 _scribe_instance = None
 _scribe_insert_fn = None  # Fonction d'insertion pour temps réel
 _token_counter = 0  # Compteur de tokens pour temps réel
+_window_tokens = None  # Tokens de la fenêtre active (None = à recompter)
+_window_cache = None  # Miroir mémoire de la fenêtre: (mtime_ns, contenu)
 
 
-def get_scribe() -> Scribe:
+_scribe_lock = threading.Lock()
+
+
+def init_scribe():
+    """Crée le Scribe et sa fonction d'insertion une seule fois (appelé au démarrage)."""
     global _scribe_instance, _scribe_insert_fn
-    if _scribe_instance is None:
-        _scribe_instance = Scribe(mode="gemini", parallel_batches=0, batch_size=2)
-        _scribe_insert_fn = _scribe_instance.get_insert_fn(
+    with _scribe_lock:
+        if _scribe_instance is not None:
+            return
+        scribe = Scribe(mode="gemini", parallel_batches=0, batch_size=2)
+        _scribe_insert_fn = scribe.get_insert_fn(
             source_file="realtime",
             source_origine="iris_realtime"
         )
+        _scribe_instance = scribe
         logger.info("✨ Scribe v4.1 initialisé (gr_id + confidence_score)")
+
+
+def get_scribe() -> Scribe:
+    # Déjà créé au démarrage : simple lecture de l'attribut module
+    if _scribe_instance is None:
+        init_scribe()
     return _scribe_instance
 
 
+# Préfixe "YYYY-MM-DDTHH:MM:SS" reformaté seulement quand la seconde change.
+# (seconde, préfixe) en un seul tuple : jamais une seconde avec le préfixe d'une autre
+_ts_cache = (-1, "")
+
+
 def get_timestamp_zulu() -> str:
-    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+    global _ts_cache
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{ns // 1_000_000:03d}Z"
 
 
 # === DÉTECTION D'OUTILS (JSON) ===
 
+# Stratégie A : bloc ```json ... ``` (compilé une fois)
+_TOOL_RE = re.compile(r'```json\s*({.*?})\s*```', re.DOTALL | re.IGNORECASE)
+
+# Stratégie B : début d'objet {"tool": (espaces, tabulations, sauts de ligne
+# tolérés) + décodeur réutilisé (raw_decode tolère le texte après l'objet)
+_TOOL_START_RE = re.compile(r'\{\s*"tool"\s*:')
+_DECODER = json.JSONDecoder()
+
+
+def _json_loads(s: str):
+    """orjson en chemin rapide, json standard en repli (NaN, etc.)."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(s)
+
+
+if MSGSPEC_AVAILABLE:
+    class _ToolCall(msgspec.Struct):
+        """Forme d'un appel d'outil. UNSET = clé "tool" absente (≠ "tool": null)."""
+        tool: Union[Optional[str], msgspec.UnsetType] = msgspec.UNSET
+        args: dict = {}
+    
+    _TOOL_DECODER = msgspec.json.Decoder(_ToolCall)
+
+
+def _decode_tool(s: str):
+    """
+    Décode un appel d'outil; None si l'objet n'a pas de clé "tool".
+    msgspec valide la forme en C; toute autre forme passe par le décodage générique.
+    """
+    if MSGSPEC_AVAILABLE:
+        try:
+            tc = _TOOL_DECODER.decode(s)
+        except msgspec.MsgspecError:
+            pass
+        else:
+            if tc.tool is msgspec.UNSET:
+                return None
+            return {"tool": tc.tool, "args": tc.args}
+    
+    data = _json_loads(s)
+    return data if "tool" in data else None
+
+
 def extract_tool_call(response: str):
     """
     Détecte un appel d'outil (JSON) de manière robuste, avec ou sans balises Markdown.
@@ -124,13 +235,16 @@ def extract_tool_call(response: str):
         
     clean_response = response.strip()
     
+    # Sonde rapide : toute stratégie exige une clé JSON "tool" dans le texte
+    if '"tool"' not in clean_response:
+        return None
+    
     # Stratégie A : Balises Markdown explicites (prioritaire)
-    pattern_strict = r'```json\s*({.*?})\s*```'
-    match = re.search(pattern_strict, clean_response, re.DOTALL | re.IGNORECASE)
+    match = _TOOL_RE.search(clean_response)
     if match:
         try:
-            data = json.loads(match.group(1))
-            if "tool" in data:
+            data = _decode_tool(match.group(1))
+            if data is not None:
                 return data
         except json.JSONDecodeError:
             pass
@@ -138,31 +252,17 @@ def extract_tool_call(response: str):
     # Stratégie B : JSON {"tool": ...} n'importe où dans la réponse
     # Cherche spécifiquement un objet avec "tool" comme clé
     # Gère les args imbriqués avec une approche plus robuste
-    tool_start = clean_response.find('{"tool"')
-    if tool_start == -1:
-        tool_start = clean_response.find('{ "tool"')
+    start_match = _TOOL_START_RE.search(clean_response)
     
-    if tool_start != -1:
-        # Trouver la fin du JSON en comptant les accolades
-        brace_count = 0
-        json_end = -1
-        for i in range(tool_start, len(clean_response)):
-            if clean_response[i] == '{':
-                brace_count += 1
-            elif clean_response[i] == '}':
-                brace_count -= 1
-                if brace_count == 0:
-                    json_end = i + 1
-                    break
-        
-        if json_end != -1:
-            try:
-                json_str = clean_response[tool_start:json_end]
-                data = json.loads(json_str)
-                if "tool" in data:
-                    return data
-            except json.JSONDecodeError:
-                pass
+    if start_match:
+        # Décodage en C à partir de l'accolade : s'arrête à la fin de l'objet
+        # (les accolades dans les chaînes ne faussent plus la détection)
+        try:
+            data, _end = _DECODER.raw_decode(clean_response, start_match.start())
+            if "tool" in data:
+                return data
+        except ValueError:
+            pass
     
     # Stratégie C : Réponse courte qui COMMENCE par { (compatibilité)
     if clean_response.startswith('{') and len(clean_response) < 500:
@@ -170,48 +270,96 @@ def extract_tool_call(response: str):
             end_index = clean_response.rfind('}')
             if end_index != -1:
                 json_str = clean_response[:end_index + 1]
-                data = json.loads(json_str)
-                if "tool" in data:
+                data = _decode_tool(json_str)
+                if data is not None:
                     return data
         except Exception:
             pass
         
     return None
 
+
 # === HELPERS CONTEXTE & SYSTÈME ===
 
 def lire_fenetre() -> str:
+    """Contenu de la fenêtre, servi depuis le miroir mémoire tant que le fichier n'a pas changé."""
+    global _window_cache, _window_tokens
+    try:
+        mtime_ns = FENETRE_ACTIVE.stat().st_mtime_ns
+    except:
+        return ""
+    
+    if _window_cache is not None and _window_cache[0] == mtime_ns:
+        return _window_cache[1]
+    
     try:
-        return FENETRE_ACTIVE.read_text(encoding='utf-8') if FENETRE_ACTIVE.exists() else ""
+        contenu = FENETRE_ACTIVE.read_text(encoding='utf-8')
     except:
         return ""
+    _window_cache = (mtime_ns, contenu)
+    _window_tokens = None  # Modifié hors de ce processus: recompter
+    return contenu
 
 
-def sauvegarder_fenetre(contenu: str):
+def sauvegarder_fenetre(contenu: str, tokens: int = None, append: bool = False):
+    """
+    Écrit la fenêtre; tokens (si connu) tient à jour le compte en cache.
+    append=True : contenu est seulement la nouvelle entrée, ajoutée en fin de
+    fichier (O(entrée) au lieu de réécrire toute la fenêtre).
+    """
+    global _window_tokens, _window_cache
     try:
-        DATA_DIR.mkdir(exist_ok=True)
-        FENETRE_ACTIVE.write_text(contenu, encoding='utf-8')
+        # DATA_DIR est créé à l'import de config : pas de mkdir par appel
+        if append:
+            # Miroir prolongé seulement s'il reflète le fichier juste avant l'ajout
+            base = None
+            if not FENETRE_ACTIVE.exists():
+                base = ""
+            elif _window_cache is not None and FENETRE_ACTIVE.stat().st_mtime_ns == _window_cache[0]:
+                base = _window_cache[1]
+            with open(FENETRE_ACTIVE, 'a', encoding='utf-8') as f:
+                f.write(contenu)
+            full = base + contenu if base is not None else None
+        else:
+            # Réécriture complète : atomique (jamais de fenêtre partielle à la lecture)
+            atomic_write_text(FENETRE_ACTIVE, contenu)
+            full = contenu
+        
+        if full is not None:
+            _window_cache = (FENETRE_ACTIVE.stat().st_mtime_ns, full)
+            _window_tokens = tokens
+        else:
+            _window_cache = None
+            _window_tokens = None
     except Exception as e:
+        _window_cache = None
+        _window_tokens = None
         logger.error(f"Save error: {e}")
 
 
-def consigner_interaction(user_msg: str, ai_msg: str) -> dict:
+def consigner_interaction(user_msg: str, ai_msg: str, timestamp: str = None) -> dict:
     """
     Consigne l'interaction dans la fenêtre active.
     Déclenche la rotation + Scribe batch si seuil atteint.
     """
-    global _token_counter
+    global _token_counter, _window_tokens, _window_cache
     
-    timestamp = get_timestamp_zulu()
+    timestamp = timestamp or get_timestamp_zulu()
     entry = f"\n[{timestamp}] User: {user_msg.strip()}\n[{timestamp}] Iris: {ai_msg.strip()}\n"
     
-    if not validate_input_size(entry)[0]:
+    # Entrée tokenisée une seule fois (même test que validate_input_size)
+    entry_tokens = count_tokens(entry)
+    if entry_tokens > MAX_INPUT:
         return {"status": "error"}
     
     current = lire_fenetre()
     
+    # Compte de la fenêtre tenu à jour à chaque écriture (recompté si inconnu)
+    if _window_tokens is None:
+        _window_tokens = count_tokens(current)
+    
     # Vérifier si rotation nécessaire
-    if count_tokens(current + entry) > THRESHOLD:
+    if _window_tokens + entry_tokens > THRESHOLD:
         # Rotation de la fenêtre
         rotation_result = rotate_window(FENETRE_ACTIVE, BUFFER_DIR, ECHANGES_DIR)
         
@@ -227,15 +375,19 @@ def consigner_interaction(user_msg: str, ai_msg: str) -> dict:
                     daemon=True
                 ).start()
         
+        # rotate_window a réécrit le fichier : relire
+        _window_cache = None
         current = lire_fenetre()
+        _window_tokens = count_tokens(current)
         _token_counter = 0  # Reset compteur après rotation
         
-    sauvegarder_fenetre(current + entry)
+    # Ajout en fin de fichier (après rotation, le fichier contient déjà current)
+    sauvegarder_fenetre(entry, _window_tokens + entry_tokens, append=True)
     
     # Mettre à jour compteur pour temps réel
-    _token_counter += count_tokens(entry)
+    _token_counter += entry_tokens
     
-    return {"status": "success", "tokens_added": count_tokens(entry)}
+    return {"status": "success", "tokens_added": entry_tokens}
 
 
 def _process_rotated_file(file_path: str):
@@ -253,7 +405,7 @@ def _process_rotated_file(file_path: str):
         logger.error(f"❌ Scribe batch erreur: {e}")
 
 
-async def declencher_scribe_async(user: str, assistant: str):
+async def declencher_scribe_async(user: str, assistant: str, ts: str = None):
     """
     Déclenche le Scribe en temps réel (segment par segment).
     NOTE: En temps réel, gr_id sera NULL car Clio traite un segment à la fois.
@@ -268,7 +420,7 @@ async def declencher_scribe_async(user: str, assistant: str):
         meta = await scribe.extractor.extract_batch_async([user, assistant])
         
         if meta and len(meta) >= 2:
-            ts = get_timestamp_zulu()
+            ts = ts or get_timestamp_zulu()
             
             # Utiliser la fonction d'insertion du Scribe (cohérente avec v4.1)
             if _scribe_insert_fn:
@@ -276,8 +428,7 @@ async def declencher_scribe_async(user: str, assistant: str):
                 user_tokens = count_tokens(user)
                 _scribe_insert_fn(ts, _token_counter, "human", meta[0])
                 
-                # Assistant message
-                assistant_tokens = count_tokens(assistant)
+                # Assistant message (seul l'offset du user est nécessaire)
                 _scribe_insert_fn(ts, _token_counter + user_tokens, "assistant", meta[1])
                 
                 logger.info(f"🖋️ Scribe temps réel: 2 segments indexés (conf: {meta[0].get('confidence_score', '?')}, {meta[1].get('confidence_score', '?')})")
@@ -286,11 +437,52 @@ async def declencher_scribe_async(user: str, assistant: str):
         logger.error(f"Scribe realtime error: {e}")
 
 
+# File Scribe temps réel : bornée, vidée par SCRIBE_WORKERS tâches persistantes
+_scribe_queue = None
+_scribe_workers = []
+
+
+async def _scribe_worker():
+    while True:
+        user, assistant, ts = await _scribe_queue.get()
+        try:
+            await declencher_scribe_async(user, assistant, ts)
+        finally:
+            _scribe_queue.task_done()
+
+
+# === PROMPTS DE SYNTHÈSE (chaînage d'outils) ===
+_SYNTHESE_HEAD = "DONNÉES COLLECTÉES:"
+_SYNTHESE_REQUETE = "\n\nREQUÊTE ORIGINALE DE SERGE : "
+_SYNTHESE_TAIL = """
+
+Si tu as assez d'informations, réponds à Serge.
+Si tu as besoin d'une autre recherche, génère le JSON approprié.
+Réponds :"""
+_FORCE_TAIL = """
+
+Tu as fait {tool_count} recherches. Synthétise maintenant ce que tu as trouvé et réponds à Serge.
+NE GÉNÈRE PAS de nouveau JSON - réponds en texte."""
+
+
 # === APP FASTAPI ===
 app = FastAPI(title="MOSS v0.10.2", version="0.10.2")
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
 
+@app.on_event("startup")
+async def _init_scribe_at_startup():
+    # Scribe prêt avant la première requête (plus d'initialisation paresseuse concurrente)
+    init_scribe()
+
+
+@app.on_event("startup")
+async def _start_scribe_workers():
+    global _scribe_queue
+    _scribe_queue = asyncio.Queue(maxsize=SCRIBE_QUEUE_SIZE)
+    _scribe_workers.extend(asyncio.create_task(_scribe_worker()) for _ in range(SCRIBE_WORKERS))
+
+
 @app.get("/")
 async def root():
     return {
@@ -326,9 +518,8 @@ async def alterego(request: Request):
         fenetre = lire_fenetre()
         
         # === LOG VISUEL : DÉBUT REQUÊTE ===
-        timestamp_debut = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         logger.info("══" * 25)
-        logger.info(f"📨 {timestamp_debut} | NOUVELLE REQUÊTE")
+        logger.info("📨 NOUVELLE REQUÊTE")
         logger.info("──" * 25)
         logger.info(f"💬 User: \"{message[:100]}{'...' if len(message) > 100 else ''}\"")
         
@@ -341,12 +532,13 @@ async def alterego(request: Request):
         
         # Tracking des outils utilisés
         tools_used = []
-        tool_results_context = ""  # Accumule les résultats pour le contexte
+        tool_chunks = []  # Résultats accumulés pour le contexte (joints à la demande)
         
         # ══════════════════════════════════════════════════════════════
         # BOUCLE DE CHAÎNAGE : Jusqu'à MAX_TOOL_CHAIN appels d'outils
         # ══════════════════════════════════════════════════════════════
         tool_count = 0
+        stuck_in_tool = False
         
         while tool_count < MAX_TOOL_CHAIN:
             tool_data = extract_tool_call(reponse_courante)
@@ -375,47 +567,44 @@ async def alterego(request: Request):
             logger.info(f"📋 Résultat ({len(resultat_outil) if resultat_outil else 0} chars): {resultat_preview}...")
             
             # Accumuler les résultats dans le contexte
-            tool_results_context += f"\n\n--- RÉSULTAT {tool_name} (query: {tool_args.get('query', '?')}) ---\n{resultat_outil}"
+            tool_chunks.append(f"\n\n--- RÉSULTAT {tool_name} (query: {tool_args.get('query', '?')}) ---\n{resultat_outil}")
             
             # ══════════════════════════════════════════════════════════════
             # APPEL SUIVANT : Iris synthétise OU demande une autre recherche
             # ══════════════════════════════════════════════════════════════
-            prompt_synthese = f"""DONNÉES COLLECTÉES:{tool_results_context}
-
-REQUÊTE ORIGINALE DE SERGE : {message}
-
-Si tu as assez d'informations, réponds à Serge.
-Si tu as besoin d'une autre recherche, génère le JSON approprié.
-Réponds :"""
+            prompt_synthese = "".join((_SYNTHESE_HEAD, *tool_chunks, _SYNTHESE_REQUETE, message, _SYNTHESE_TAIL))
 
             reponse_courante = gemini.chat(prompt_synthese, context=fenetre)
             logger.info(f"📝 DEBUG reponse_{tool_count}: {reponse_courante[:200] if reponse_courante else 'VIDE'}...")
+        else:
+            # Sortie par épuisement du quota (pas par break) : seule la dernière
+            # réponse, jamais examinée par la boucle, reste à analyser
+            stuck_in_tool = extract_tool_call(reponse_courante) is not None
         
         # Si on a atteint le max d'outils et la réponse est encore un JSON
-        if tool_count >= MAX_TOOL_CHAIN and extract_tool_call(reponse_courante):
+        if stuck_in_tool:
             logger.warning(f"⚠️ Max tool chain ({MAX_TOOL_CHAIN}) atteint, forçage synthèse")
             # Forcer une synthèse finale
-            prompt_force = f"""DONNÉES COLLECTÉES:{tool_results_context}
-
-REQUÊTE ORIGINALE DE SERGE : {message}
-
-Tu as fait {tool_count} recherches. Synthétise maintenant ce que tu as trouvé et réponds à Serge.
-NE GÉNÈRE PAS de nouveau JSON - réponds en texte."""
+            prompt_force = "".join((_SYNTHESE_HEAD, *tool_chunks, _SYNTHESE_REQUETE, message,
+                                    _FORCE_TAIL.format(tool_count=tool_count)))
 
             reponse_courante = gemini.chat(prompt_force, context=fenetre)
         
         reponse_finale = reponse_courante
         
-        # Consignation & Scribe
-        consigner_interaction(message, reponse_finale)
-        asyncio.create_task(declencher_scribe_async(message, reponse_finale))
+        # Consignation & Scribe (un seul horodatage pour fenêtre, Scribe et réponse)
+        ts = get_timestamp_zulu()
+        consigner_interaction(message, reponse_finale, ts)
+        try:
+            _scribe_queue.put_nowait((message, reponse_finale, ts))
+        except asyncio.QueueFull:
+            logger.warning("⚠️ File Scribe pleine, indexation temps réel ignorée (rattrapée au batch)")
         
         # === LOG VISUEL : FIN REQUÊTE ===
-        timestamp_fin = datetime.now().strftime('%H:%M:%S')
         logger.info(f"🤖 Iris: \"{reponse_finale[:100]}{'...' if len(reponse_finale) > 100 else ''}\"")
         
         tools_summary = f" | Outils: {' → '.join(tools_used)}" if tools_used else ""
-        logger.info(f"✅ {timestamp_fin} | Réponse ({len(reponse_finale)} chars){tools_summary}")
+        logger.info(f"✅ Réponse ({len(reponse_finale)} chars){tools_summary}")
         logger.info("══" * 25)
         
         return {
@@ -423,7 +612,8 @@ NE GÉNÈRE PAS de nouveau JSON - réponds en texte."""
             "metadata": {
                 "tools_used": tools_used,
                 "tool_count": len(tools_used),
-                "version": "0.10.2"
+                "version": "0.10.2",
+                "timestamp": ts
             }
         }
         
@@ -468,4 +658,4 @@ if __name__ == "__main__":
     print(f"🚀 MOSS v0.10.2 - Iris (chaînage max {MAX_TOOL_CHAIN} outils)")
     print(f"   📊 Scribe v4.1 intégré (gr_id + confidence_score)")
     print(f"   📁 Logs: {log_file}")
-    uvicorn.run(app, host=HOST, port=PORT)
+    uvicorn.run(app, host=HOST, port=PORT, log_config=None)
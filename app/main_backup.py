@@ -10,21 +10,36 @@ Version: 0.6.0
 - Conservation des endpoints existants pour rétrocompatibilité
 """
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from datetime import datetime, timezone
 from pathlib import Path
 import logging
 import importlib
 import asyncio
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Optionnel: orjson (C) pour le parsing des requêtes et la sérialisation des réponses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    JSONResponse = ORJSONResponse  # Réponses d'erreur explicites incluses
 
 from config import HOST, PORT, DATA_DIR, BUFFER_DIR
 from utils.context_window import (
     count_tokens, 
+    count_tokens_batch,
     should_rotate, 
     rotate_window, 
-    get_window_status,
     validate_input_size,
     process_large_input,
     THRESHOLD,
@@ -46,6 +61,21 @@ logger = logging.getLogger(__name__)
 # === FICHIERS ===
 FENETRE_ACTIVE = DATA_DIR / "fenetre_active.txt"
 
+# === CONTEXTE RÉCENT (fin de la fenêtre active injectée dans le prompt) ===
+CONTEXTE_RECENT_CHARS = 5000
+CONTEXTE_LEGACY_CHARS = 10000
+
+# === HERMÈS ===
+# Intentions du QueryProfiler qui ne demandent pas de recherche en mémoire
+NO_MEMORY_INTENTS = frozenset({"conversation"})
+
+# Statistiques Hermès de / gardées HERMES_STATS_TTL secondes (COUNT sur metadata)
+HERMES_STATS_TTL = 15.0
+
+# === SCRIBE TEMPS RÉEL ===
+SCRIBE_BATCH_MAX = 8  # Échanges max par extraction / passe d'insertion
+SCRIBE_QUEUE_SIZE = 64  # File bornée (au-delà: échange ignoré en temps réel)
+
 # === GEMINI PROVIDER (singleton) ===
 gemini = GeminiProvider()
 query_profiler = QueryProfiler()
@@ -100,11 +130,24 @@ ACTIONS_DISPONIBLES = {
     }
 }
 
+# Listes dérivées, calculées une fois (réponses de /, /actions et erreurs de /go)
+ACTIONS_NOMS = list(ACTIONS_DISPONIBLES)
+ACTIONS_TOTAL = len(ACTIONS_NOMS)
+
+# Fonctions run() des actions, résolues une fois au chargement (action -> run)
+ACTION_HANDLERS = {}
+for _action in ACTIONS_DISPONIBLES:
+    try:
+        ACTION_HANDLERS[_action] = importlib.import_module(f"actions.{_action}").run
+    except Exception as e:
+        logger.warning(f"⚠️ Action '{_action}' indisponible: {e}")
+
 # === APP ===
 app = FastAPI(
     title="AIter Ego / MOSS",
     description="Memory-Oriented Semantic System - Architecture hybride Hermès + Gemini + Scribe",
-    version="0.6.0"
+    version="0.6.0",
+    default_response_class=JSONResponse
 )
 
 # CORS pour accès depuis n'importe où
@@ -118,56 +161,189 @@ app.add_middleware(
 
 
 # === HELPERS ===
+async def lire_json(request: Request):
+    """Corps JSON de la requête (orjson si disponible)."""
+    body = await request.body()
+    return orjson.loads(body) if ORJSON_AVAILABLE else json.loads(body)
+
+
 def get_timestamp_zulu() -> str:
     """Retourne timestamp au format Zulu (UTC)."""
     return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
 
 
+# Miroir mémoire de la fenêtre active : segments ajoutés depuis le dernier
+# chargement (le fichier n'est relu qu'à froid ou après une rotation).
+# None = à recharger depuis le disque
+_fenetre_segments = None
+
+# Compte de tokens de la fenêtre active, tenu à jour à chaque écriture
+# (None = inconnu, recompté depuis le disque au prochain besoin)
+_fenetre_tokens = None
+
+# Réentrant : tokens_fenetre() relit la fenêtre pendant une consignation
+_fenetre_lock = threading.RLock()
+
+# Pool dédié aux E/S de la fenêtre (isolé du threadpool par défaut qui sert
+# Hermès, Gemini et les actions). Les écritures restent sérialisées par _fenetre_lock.
+WINDOW_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="window-io")
+
+
+async def executer_io_fenetre(fn, *args):
+    """Exécute une opération sur la fenêtre dans WINDOW_EXECUTOR."""
+    return await asyncio.get_running_loop().run_in_executor(WINDOW_EXECUTOR, fn, *args)
+
+
+def _charger_fenetre() -> deque:
+    """Retourne le miroir de la fenêtre (chargé depuis le disque si nécessaire)."""
+    global _fenetre_segments
+    if _fenetre_segments is None:
+        try:
+            contenu = FENETRE_ACTIVE.read_text(encoding='utf-8') if FENETRE_ACTIVE.exists() else ""
+        except Exception as e:
+            logger.error(f"Erreur lecture fenêtre: {e}")
+            return deque()
+        _fenetre_segments = deque([contenu] if contenu else [])
+    return _fenetre_segments
+
+
+def rotation_fenetre() -> dict:
+    """Rotation manuelle (archive + overlap), miroir rechargé ensuite."""
+    with _fenetre_lock:
+        result = rotate_window(FENETRE_ACTIVE, BUFFER_DIR)
+        invalider_fenetre()
+    return result
+
+
+def invalider_fenetre():
+    """Le fichier a été réécrit hors de ce module (rotation) : miroir et compte à recharger."""
+    global _fenetre_segments, _fenetre_tokens
+    with _fenetre_lock:
+        _fenetre_segments = None
+        _fenetre_tokens = None
+
+
 def lire_fenetre() -> str:
-    """Lit la fenêtre de contexte active."""
-    try:
-        if FENETRE_ACTIVE.exists():
-            return FENETRE_ACTIVE.read_text(encoding='utf-8')
-        return ""
-    except Exception as e:
-        logger.error(f"Erreur lecture fenêtre: {e}")
-        return ""
+    """Lit la fenêtre de contexte active (depuis le miroir mémoire)."""
+    with _fenetre_lock:
+        return "".join(_charger_fenetre())
+
+
+def lire_fin_fenetre(n_chars: int) -> str:
+    """Derniers n_chars de la fenêtre, sans joindre tout le miroir (contexte récent)."""
+    parts = []
+    total = 0
+    with _fenetre_lock:
+        for segment in reversed(_charger_fenetre()):
+            parts.append(segment)
+            total += len(segment)
+            if total >= n_chars:
+                break
+    parts.reverse()
+    return "".join(parts)[-n_chars:]
+
+
+def tokens_fenetre() -> int:
+    """
+    Tokens de la fenêtre active (compteur en mémoire, recompté à froid).
+    Test et recompte sous _fenetre_lock : une consignation concurrente ne peut
+    pas être écrasée par un recompte périmé. Peut bloquer → executer_io_fenetre.
+    """
+    global _fenetre_tokens
+    with _fenetre_lock:
+        if _fenetre_tokens is None:
+            _fenetre_tokens = count_tokens(lire_fenetre())
+        return _fenetre_tokens
 
 
-def sauvegarder_fenetre(contenu: str):
-    """Sauvegarde la fenêtre de contexte active."""
-    try:
-        DATA_DIR.mkdir(exist_ok=True)
-        FENETRE_ACTIVE.write_text(contenu, encoding='utf-8')
-    except Exception as e:
-        logger.error(f"Erreur sauvegarde fenêtre: {e}")
+@app.on_event("startup")
+async def _charger_fenetre_au_demarrage():
+    """Charge le miroir et le compte de la fenêtre une fois, hors du chemin des requêtes."""
+    await executer_io_fenetre(tokens_fenetre)
+
+
+def statut_fenetre() -> dict:
+    """Équivalent de get_window_status() basé sur le compteur en mémoire."""
+    tokens = tokens_fenetre()
+    return {
+        "tokens": tokens,
+        "threshold": THRESHOLD,
+        "usage_percent": round((tokens / THRESHOLD) * 100, 1),
+        "should_rotate": tokens > THRESHOLD
+    }
+
+
+def sauvegarder_fenetre(contenu: str, tokens: int = None):
+    """Sauvegarde la fenêtre de contexte active (tokens = compte de contenu si connu)."""
+    global _fenetre_segments, _fenetre_tokens
+    with _fenetre_lock:
+        try:
+            DATA_DIR.mkdir(exist_ok=True)
+            FENETRE_ACTIVE.write_text(contenu, encoding='utf-8')
+            _fenetre_segments = deque([contenu] if contenu else [])
+            _fenetre_tokens = tokens
+        except Exception as e:
+            _fenetre_segments = None
+            _fenetre_tokens = None
+            logger.error(f"Erreur sauvegarde fenêtre: {e}")
+
+
+def append_fenetre(contenu: str, tokens: int = None):
+    """Ajoute à la fin de la fenêtre active (écrit seulement le nouveau contenu)."""
+    global _fenetre_segments, _fenetre_tokens
+    with _fenetre_lock:
+        try:
+            DATA_DIR.mkdir(exist_ok=True)
+            with open(FENETRE_ACTIVE, 'a', encoding='utf-8') as f:
+                f.write(contenu)
+            if _fenetre_segments is not None:
+                _fenetre_segments.append(contenu)
+            if _fenetre_tokens is not None and tokens is not None:
+                _fenetre_tokens += tokens
+            else:
+                _fenetre_tokens = None
+        except Exception as e:
+            _fenetre_segments = None
+            _fenetre_tokens = None
+            logger.error(f"Erreur ajout fenêtre: {e}")
 
 
 def consigner_interaction(message_user: str, message_assistant: str) -> dict:
     """
     Ajoute une interaction à la fenêtre avec horodatage.
     Gère les gros messages et la rotation automatique.
+    Appelée depuis des threads : une seule consignation à la fois.
     
     Returns:
         dict avec infos sur le traitement
     """
+    with _fenetre_lock:
+        return _consigner_interaction(message_user, message_assistant)
+
+
+def _consigner_interaction(message_user: str, message_assistant: str) -> dict:
+    global _fenetre_tokens
+    
     timestamp = get_timestamp_zulu()
     
     # Nouvelle ligne à ajouter
     nouvelle_ligne = f"\n[{timestamp}] Utilisateur : {message_user.strip()}\n[{timestamp}] AIter Ego : {message_assistant.strip()}\n"
     
-    tokens_nouveau = count_tokens(nouvelle_ligne)
+    # Compte de la fenêtre actuelle (compteur en mémoire, pas de relecture) ;
+    # à froid, nouvelle ligne et fenêtre sont tokenisées en un seul appel
+    if _fenetre_tokens is None:
+        tokens_nouveau, tokens_actuels = count_tokens_batch([nouvelle_ligne, lire_fenetre()])
+        _fenetre_tokens = tokens_actuels
+    else:
+        tokens_nouveau = count_tokens(nouvelle_ligne)
+        tokens_actuels = _fenetre_tokens
     
     # Vérifier si le message est trop volumineux (> 180K)
-    is_valid, error = validate_input_size(nouvelle_ligne)
+    is_valid, error = validate_input_size(nouvelle_ligne, tokens_nouveau)
     if not is_valid:
         logger.error(f"❌ Message rejeté: {error}")
         return {"status": "error", "error": error}
     
-    # Lire fenêtre actuelle
-    fenetre_actuelle = lire_fenetre()
-    tokens_actuels = count_tokens(fenetre_actuelle)
-    
     # Cas 1: Message très volumineux (> 90K) - découper en chunks
     if tokens_nouveau > THRESHOLD:
         logger.info(f"📦 CHUNKING: Message de {tokens_nouveau} tokens (> {THRESHOLD})")
@@ -180,7 +356,7 @@ def consigner_interaction(message_user: str, message_assistant: str) -> dict:
                 logger.info(f"   → Fenêtre actuelle archivée: {rotate_result.get('archive', 'N/A')}")
             
             # Les chunks sont déjà archivés, mettre le dernier dans la fenêtre
-            sauvegarder_fenetre(result["active_chunk"])
+            sauvegarder_fenetre(result["active_chunk"], result["active_chunk_tokens"])
             
             logger.info(f"   → {result['chunks_count']} chunks créés")
             logger.info(f"   → {len(result['archived'])} chunks archivés dans buffer")
@@ -194,54 +370,55 @@ def consigner_interaction(message_user: str, message_assistant: str) -> dict:
         result = rotate_window(FENETRE_ACTIVE, BUFFER_DIR)
         logger.info(f"   → Archive: {result.get('archive', 'N/A')}")
         logger.info(f"   → Overlap: {result.get('tokens_overlap', 0)} tokens")
-        
-        # Relire la fenêtre (maintenant avec overlap seulement)
-        fenetre_actuelle = lire_fenetre()
+        # La fenêtre ne contient plus que l'overlap : l'ajout se fait à la suite.
+        # Elle est réécrite avec les instructions système (non comptées dans
+        # tokens_overlap) : miroir et compte rechargés une fois au prochain besoin
+        invalider_fenetre()
     
-    # Cas 3: Ajout normal
-    sauvegarder_fenetre(fenetre_actuelle + nouvelle_ligne)
+    # Cas 3: Ajout normal (append, seule la rotation réécrit le fichier)
+    append_fenetre(nouvelle_ligne, tokens_nouveau)
     
     # Log du statut
-    status = get_window_status(FENETRE_ACTIVE)
+    status = statut_fenetre()
     logger.info(f"📊 Fenêtre: {status['tokens']} tokens ({status['usage_percent']}%)")
     
     return {"status": "success", "tokens_added": tokens_nouveau}
 
 
-async def declencher_scribe_async(message_user: str, message_assistant: str):
+async def consigner_en_arriere_plan(message_user: str, message_assistant: str):
+    """Consignation en tâche de fond (pool de la fenêtre) : les erreurs sont journalisées."""
+    consign_result = await executer_io_fenetre(consigner_interaction, message_user, message_assistant)
+    if consign_result.get("status") == "error":
+        logger.warning(f"⚠️ Erreur consignation: {consign_result.get('error')}")
+
+
+async def declencher_scribe_async(echanges: list):
     """
-    Déclenche le Scribe en arrière-plan (fire & forget).
-    Indexe l'échange dans SQLite via Gemini 2.5-flash-lite.
+    Indexe un lot d'échanges (message_user, message_assistant, timestamp)
+    dans SQLite via Gemini 2.5-flash-lite : une seule extraction pour tout le lot.
     
-    Cette fonction est non-bloquante et n'impacte pas le temps de réponse.
+    Appelée par le worker Scribe, n'impacte pas le temps de réponse.
     """
     try:
         scribe = get_scribe()
-        timestamp = get_timestamp_zulu()
         
-        # Extraction async des métadonnées pour les deux messages
-        texts = [message_user, message_assistant]
+        # Extraction async des métadonnées (user, assistant) de tous les échanges
+        texts = [texte for message_user, message_assistant, _ in echanges
+                 for texte in (message_user, message_assistant)]
         metadatas = await scribe.extractor.extract_batch_async(texts)
         
-        # Insertion dans SQLite
-        if metadatas and len(metadatas) >= 2:
-            scribe._insert_metadata(
-                timestamp=timestamp,
-                token_start=0,
-                source_file="realtime",
-                source_origine="conversation",
-                auteur="human",
-                metadata=metadatas[0]
+        # Insertion dans SQLite (un executemany, une transaction pour tout le lot),
+        # hors boucle : vecteurs TriLDaSA et attente du verrou (busy_timeout)
+        if metadatas and len(metadatas) >= len(texts):
+            rows = []
+            for i, (_, _, timestamp) in enumerate(echanges):
+                rows.append((timestamp, 0, 0, "human", metadatas[2 * i]))
+                rows.append((timestamp, 0, 0, "assistant", metadatas[2 * i + 1]))
+            indexed = await asyncio.to_thread(
+                scribe._insert_metadata_many,
+                rows, source_file="realtime", source_origine="conversation"
             )
-            scribe._insert_metadata(
-                timestamp=timestamp,
-                token_start=0,
-                source_file="realtime",
-                source_origine="conversation",
-                auteur="assistant",
-                metadata=metadatas[1]
-            )
-            logger.info(f"✅ SCRIBE: 2 segments indexés")
+            logger.info(f"✅ SCRIBE: {indexed} segments indexés ({len(echanges)} échanges)")
         else:
             logger.warning(f"⚠️ SCRIBE: Métadonnées incomplètes")
         
@@ -249,16 +426,95 @@ async def declencher_scribe_async(message_user: str, message_assistant: str):
         logger.error(f"❌ Erreur Scribe async: {e}")
 
 
+# === FILE SCRIBE (worker unique, lots) ===
+# Créée au démarrage (boucle asyncio du serveur)
+_scribe_queue = None
+
+
+async def _scribe_worker():
+    """Vide la file par lots de SCRIBE_BATCH_MAX échanges au plus."""
+    while True:
+        batch = [await _scribe_queue.get()]
+        try:
+            while len(batch) < SCRIBE_BATCH_MAX:
+                batch.append(_scribe_queue.get_nowait())
+        except asyncio.QueueEmpty:
+            pass
+        try:
+            await declencher_scribe_async(batch)
+        finally:
+            for _ in batch:
+                _scribe_queue.task_done()
+
+
+@app.on_event("startup")
+async def _start_scribe_worker():
+    global _scribe_queue
+    _scribe_queue = asyncio.Queue(maxsize=SCRIBE_QUEUE_SIZE)
+    asyncio.create_task(_scribe_worker())
+
+
+@app.on_event("startup")
+async def _prechauffer_singletons():
+    """Scribe (extracteur, TriLDaSA, SQLite) et Hermès prêts avant la première requête."""
+    try:
+        await asyncio.to_thread(get_scribe)
+    except Exception as e:
+        logger.warning(f"⚠️ Préchauffage Scribe impossible: {e}")
+    try:
+        await asyncio.to_thread(stats_hermes)
+    except Exception as e:
+        logger.warning(f"⚠️ Préchauffage Hermès impossible: {e}")
+
+
 # === ROUTES PRINCIPALES ===
 
+# (instant monotonic, statistiques) du dernier appel stats d'Hermès
+_hermes_stats_cache = (0.0, None)
+
+
+def stats_hermes() -> dict:
+    """Statistiques Hermès, recalculées au plus toutes les HERMES_STATS_TTL secondes."""
+    global _hermes_stats_cache
+    now = time.monotonic()
+    fetched_at, stats = _hermes_stats_cache
+    if stats is None or now - fetched_at >= HERMES_STATS_TTL:
+        stats = hermes_search({"action": "stats"})
+        _hermes_stats_cache = (now, stats)
+    return stats
+
+
+# Partie fixe de la réponse de / (les champs à None sont remplis à chaque appel,
+# l'ordre des clés est conservé)
+_ROOT_STATIQUE = {
+    "message": "🧠 AIter Ego / MOSS fonctionne!",
+    "version": "0.6.0",
+    "architecture": "Hermès (local) + Gemini (cloud) + Scribe (async)",
+    "timestamp": None,
+    "agent": "Gemini 2.5 Flash",
+    "scribe": None,
+    "fenetre": None,
+    "hermes": None,
+    "actions_disponibles": ACTIONS_TOTAL,
+    "endpoints": {
+        "conversation": "/alterego",
+        "actions": "/go",
+        "liste_actions": "/actions",
+        "hermes_search": "/hermes",
+        "scribe_status": "/scribe",
+        "documentation": "/docs"
+    }
+}
+
+
 @app.get("/")
 async def root():
     """Page d'accueil avec statut complet."""
-    fenetre = get_window_status(FENETRE_ACTIVE)
+    fenetre = await executer_io_fenetre(statut_fenetre)
     
-    # Statut Hermès (SQLite)
+    # Statut Hermès (SQLite, mis en cache quelques secondes)
     try:
-        hermes_stats = hermes_search({"action": "stats"})
+        hermes_stats = stats_hermes()
     except:
         hermes_stats = {"segments": 0}
     
@@ -272,27 +528,16 @@ async def root():
     except:
         scribe_status = {"mode": "non initialisé"}
     
-    return {
-        "message": "🧠 AIter Ego / MOSS fonctionne!",
-        "version": "0.6.0",
-        "architecture": "Hermès (local) + Gemini (cloud) + Scribe (async)",
-        "timestamp": get_timestamp_zulu(),
-        "agent": "Gemini 2.5 Flash",
-        "scribe": scribe_status,
-        "fenetre": fenetre,
-        "hermes": {
+    reponse = _ROOT_STATIQUE.copy()
+    reponse.update(
+        timestamp=get_timestamp_zulu(),
+        scribe=scribe_status,
+        fenetre=fenetre,
+        hermes={
             "segments": hermes_stats.get("total_segments", hermes_stats.get("segments", 0))
-        },
-        "actions_disponibles": len(ACTIONS_DISPONIBLES),
-        "endpoints": {
-            "conversation": "/alterego",
-            "actions": "/go",
-            "liste_actions": "/actions",
-            "hermes_search": "/hermes",
-            "scribe_status": "/scribe",
-            "documentation": "/docs"
         }
-    }
+    )
+    return reponse
 
 
 @app.get("/health")
@@ -308,7 +553,7 @@ async def liste_actions():
     """Liste toutes les actions disponibles."""
     return {
         "actions": ACTIONS_DISPONIBLES,
-        "total": len(ACTIONS_DISPONIBLES),
+        "total": ACTIONS_TOTAL,
         "timestamp": get_timestamp_zulu()
     }
 
@@ -324,7 +569,7 @@ async def executer_action(request: Request):
     # Récupérer les paramètres (GET ou POST)
     if request.method == "POST":
         try:
-            params = await request.json()
+            params = await lire_json(request)
         except:
             params = {}
     else:
@@ -337,25 +582,25 @@ async def executer_action(request: Request):
             status_code=400,
             content={
                 "error": "Paramètre 'action' manquant",
-                "actions_disponibles": list(ACTIONS_DISPONIBLES.keys()),
+                "actions_disponibles": ACTIONS_NOMS,
                 "exemple": "/go?action=read&fichier=data/test.txt"
             }
         )
     
-    if action not in ACTIONS_DISPONIBLES:
+    handler = ACTION_HANDLERS.get(action)
+    if handler is None:
         return JSONResponse(
             status_code=404,
             content={
                 "error": f"Action '{action}' inconnue",
-                "actions_disponibles": list(ACTIONS_DISPONIBLES.keys())
+                "actions_disponibles": ACTIONS_NOMS
             }
         )
     
     try:
-        # Importer et exécuter l'action dynamiquement
+        # Exécuter l'action (E/S fichiers/SQLite) hors de la boucle asyncio
         logger.info(f"⚡ Action: {action} avec params: {params}")
-        module = importlib.import_module(f"actions.{action}")
-        result = module.run(params)
+        result = await asyncio.to_thread(handler, params)
         
         return {
             "action": action,
@@ -394,7 +639,7 @@ async def hermes_endpoint(request: Request):
     # Récupérer les paramètres
     if request.method == "POST":
         try:
-            params = await request.json()
+            params = await lire_json(request)
         except:
             params = {}
     else:
@@ -448,7 +693,7 @@ async def scribe_index_manual(request: Request):
     POST: {"message_user": "...", "message_assistant": "..."}
     """
     try:
-        data = await request.json()
+        data = await lire_json(request)
         message_user = data.get("message_user", "")
         message_assistant = data.get("message_assistant", "")
         
@@ -459,7 +704,7 @@ async def scribe_index_manual(request: Request):
             )
         
         # Appel synchrone pour test manuel
-        await declencher_scribe_async(message_user, message_assistant)
+        await declencher_scribe_async([(message_user, message_assistant, get_timestamp_zulu())])
         
         return {
             "status": "indexed",
@@ -479,7 +724,7 @@ async def scribe_index_manual(request: Request):
 @app.get("/fenetre")
 async def fenetre_status():
     """Retourne le statut de la fenêtre de contexte."""
-    status = get_window_status(FENETRE_ACTIVE)
+    status = await executer_io_fenetre(statut_fenetre)
     return {
         "fenetre": status,
         "seuil_rotation": THRESHOLD,
@@ -491,10 +736,11 @@ async def fenetre_status():
 @app.get("/contexte")
 async def get_contexte():
     """Retourne le contexte actuel (pour debug)."""
-    contenu = lire_fenetre()
+    contenu = await executer_io_fenetre(lire_fenetre)
+    tokens = await executer_io_fenetre(tokens_fenetre)
     return {
         "contexte": contenu,
-        "tokens": count_tokens(contenu),
+        "tokens": tokens,
         "timestamp": get_timestamp_zulu()
     }
 
@@ -502,7 +748,7 @@ async def get_contexte():
 @app.delete("/contexte")
 async def clear_contexte():
     """Efface le contexte (reset)."""
-    sauvegarder_fenetre("")
+    await executer_io_fenetre(sauvegarder_fenetre, "", 0)
     return {
         "message": "Contexte effacé",
         "timestamp": get_timestamp_zulu()
@@ -512,7 +758,7 @@ async def clear_contexte():
 @app.post("/rotation")
 async def force_rotation():
     """Force une rotation manuelle (pour tests)."""
-    result = rotate_window(FENETRE_ACTIVE, BUFFER_DIR)
+    result = await executer_io_fenetre(rotation_fenetre)
     return {
         "rotation": result,
         "timestamp": get_timestamp_zulu()
@@ -522,7 +768,7 @@ async def force_rotation():
 # === ROUTE CONVERSATION PRINCIPALE (REFONTE v0.6.0) ===
 
 @app.post("/alterego")
-async def alterego(request: Request):
+async def alterego(request: Request, background_tasks: BackgroundTasks):
     """
     Endpoint principal - Flux complet MOSS:
     1. User envoie message
@@ -535,7 +781,7 @@ async def alterego(request: Request):
     logger.info("💬 Requête reçue sur /alterego")
     
     try:
-        data = await request.json()
+        data = await lire_json(request)
         message = data.get("message", "")
         
         if not message:
@@ -565,13 +811,25 @@ async def alterego(request: Request):
             profile = None
 
         # === ÉTAPE 2: Hermès cherche le contexte mémoire ===
-        logger.info("🔍 HERMÈS: Recherche contexte mémoire...")
+        # (en parallèle de la lecture de la fenêtre active, deux E/S indépendantes)
+        if profile and profile.intent in NO_MEMORY_INTENTS:
+            logger.info("🔍 HERMÈS: Ignoré (intention sans mémoire)")
+            hermes_result = {}
+            fenetre_active = await executer_io_fenetre(lire_fin_fenetre, CONTEXTE_RECENT_CHARS)
+        else:
+            logger.info("🔍 HERMÈS: Recherche contexte mémoire...")
+            hermes_result, fenetre_active = await asyncio.gather(
+                asyncio.to_thread(hermes_search, {
+                    "query": message,
+                    "top_k": 5,
+                    "profile": profile
+                }),
+                executer_io_fenetre(lire_fin_fenetre, CONTEXTE_RECENT_CHARS),
+                return_exceptions=True
+            )
         try:
-            hermes_result = hermes_search({
-                "query": message,
-                "top_k": 5,
-                "profile": profile
-            })
+            if isinstance(hermes_result, Exception):
+                raise hermes_result
             contexte_memoire = hermes_result.get("formatted_context", "")
             hermes_segments = hermes_result.get("count", 0)
             logger.info(f"   → {hermes_segments} segments trouvés")
@@ -581,8 +839,10 @@ async def alterego(request: Request):
             hermes_segments = 0
         
         # Contexte de la fenêtre active (court terme)
-        fenetre_active = lire_fenetre()
-        contexte_recent = fenetre_active[-5000:] if fenetre_active else ""
+        if isinstance(fenetre_active, Exception):
+            logger.error(f"Erreur lecture fenêtre: {fenetre_active}")
+            fenetre_active = ""
+        contexte_recent = fenetre_active
         
         # === ÉTAPE 3: Gemini répond avec le contexte ===
         logger.info("🤖 GEMINI: Génération de la réponse...")
@@ -594,7 +854,8 @@ async def alterego(request: Request):
             if contexte_recent:
                 contexte_complet += f"=== CONVERSATION RÉCENTE ===\n{contexte_recent}\n"
             
-            reponse = gemini.chat(message, context=contexte_complet if contexte_complet else None)
+            # Appel HTTP bloquant : exécuté hors de la boucle asyncio
+            reponse = await asyncio.to_thread(gemini.chat, message, contexte_complet or None)
             logger.info(f"   → Réponse générée ({len(reponse)} caractères)")
             
         except Exception as e:
@@ -604,17 +865,18 @@ async def alterego(request: Request):
                 content={"error": f"Erreur Agent Gemini: {str(e)}"}
             )
         
-        # === ÉTAPE 4: Consigner l'interaction ===
-        consign_result = consigner_interaction(message, reponse)
-        
-        if consign_result.get("status") == "error":
-            logger.warning(f"⚠️ Erreur consignation: {consign_result.get('error')}")
+        # === ÉTAPE 4: Consigner l'interaction (après l'envoi de la réponse) ===
+        background_tasks.add_task(consigner_en_arriere_plan, message, reponse)
         
-        # === ÉTAPE 5: Scribe en arrière-plan (fire & forget) ===
-        asyncio.create_task(declencher_scribe_async(message, reponse))
+        # === ÉTAPE 5: Scribe en arrière-plan (file, indexé par lots) ===
+        try:
+            _scribe_queue.put_nowait((message, reponse, get_timestamp_zulu()))
+        except asyncio.QueueFull:
+            logger.warning("⚠️ File Scribe pleine, indexation temps réel ignorée (rattrapée au batch)")
         
-        # Récupérer statut fenêtre pour metadata
-        fenetre = get_window_status(FENETRE_ACTIVE)
+        # Statut fenêtre pour metadata : lu AVANT la consignation (tâche de fond),
+        # l'échange qui vient d'être envoyé n'y est pas encore compté
+        fenetre = await executer_io_fenetre(statut_fenetre)
         
         return {
             "message": reponse,
@@ -625,8 +887,8 @@ async def alterego(request: Request):
                 "hermes_segments": hermes_segments,
                 "contexte_injecte": bool(contexte_complet)
             },
-            "fenetre": fenetre,
-            "consignation": consign_result.get("status", "success")
+            "fenetre_avant_consignation": fenetre,
+            "consignation": "scheduled"
         }
         
     except Exception as e:
@@ -650,7 +912,7 @@ async def alterego_legacy(request: Request):
     logger.info("💬 Requête reçue sur /alterego-legacy (Ollama)")
     
     try:
-        data = await request.json()
+        data = await lire_json(request)
         message = data.get("message", "")
         
         if not message:
@@ -660,14 +922,14 @@ async def alterego_legacy(request: Request):
             )
         
         # Lire le contexte existant
-        contexte = lire_fenetre()
+        contexte = lire_fin_fenetre(CONTEXTE_LEGACY_CHARS)
         
         # Construire le system prompt
         system_prompt = f"""Tu es AIter Ego, un assistant personnel avec mémoire persistante.
 
 Voici ta mémoire contextuelle (conversations précédentes):
 ---
-{contexte[-10000:] if contexte else "(Aucun historique)"}
+{contexte if contexte else "(Aucun historique)"}
 ---
 
 Instructions:
@@ -686,9 +948,9 @@ Instructions:
         reponse = result["response"]
         
         # Consigner l'interaction
-        consign_result = consigner_interaction(message, reponse)
+        consign_result = await executer_io_fenetre(consigner_interaction, message, reponse)
         
-        fenetre = get_window_status(FENETRE_ACTIVE)
+        fenetre = await executer_io_fenetre(statut_fenetre)
         
         return {
             "message": reponse,
@@ -753,7 +1015,7 @@ if __name__ == "__main__":
     print(f"📚 Documentation: http://{HOST}:{PORT}/docs")
     print(f"📊 Fenêtre de contexte: {THRESHOLD:,} tokens max")
     print(f"📦 Input maximum: {MAX_INPUT:,} tokens")
-    print(f"⚡ Actions disponibles: {len(ACTIONS_DISPONIBLES)}")
+    print(f"⚡ Actions disponibles: {ACTIONS_TOTAL}")
     print("=" * 60)
     
     uvicorn.run(app, host=HOST, port=PORT)
\ No newline at end of file
@@ -1,53 +1,124 @@
 """
-Migration Batch Pilot — Génère les vecteurs TriLDaSA pour 1000 segments
+Migration Batch Pilot — Génère les vecteurs TriLDaSA pour 10000 segments
 """
 import sqlite3
 import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.trildasa_engine import TrildasaEngine
+from utils.sqlite_tuning import tune_sqlite
+
+# Optionnel: orjson pour sérialiser les vecteurs (clés int -> str, format compact)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _dumps(vector) -> str:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(vector, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(vector, separators=(',', ':'))
 
 # Configuration
 DB_PATH = Path.home() / "Dropbox/aiterego_memory/metadata.db"
-BATCH_SIZE = 1000
+BATCH_SIZE = 10000
+FETCH_SIZE = 200  # Lignes lues (et commitées) par tranche
+
+# Requêtes fixes (texte identique : réutilisées par le cache de statements de sqlite3)
+SELECT_SQL = """
+    SELECT * FROM metadata 
+    WHERE vecteur_trildasa IS NULL OR vecteur_trildasa = ''
+    LIMIT ?
+"""
+UPDATE_SQL = """
+    UPDATE metadata 
+    SET vecteur_trildasa = ? 
+    WHERE id = ?
+"""
+
+# Connexions réutilisées d'un appel à l'autre (une paire par thread)
+_tls = threading.local()
+
+def get_conn() -> sqlite3.Connection:
+    """Connexion d'écriture du thread courant (ouverte et réglée une fois)."""
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        # PRAGMAs de chargement en masse (utils.sqlite_tuning)
+        conn = tune_sqlite(sqlite3.connect(DB_PATH))
+        _tls.conn = conn
+    return conn
+
+def _get_reader() -> sqlite3.Connection:
+    """Connexion de lecture du thread courant (ouverte une fois)."""
+    reader = getattr(_tls, "reader", None)
+    if reader is None:
+        reader = sqlite3.connect(DB_PATH)
+        reader.row_factory = sqlite3.Row  # Permet d'accéder aux colonnes par nom
+        _tls.reader = reader
+    return reader
 
-def migrate_batch():
-    engine = TrildasaEngine()
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Permet d'accéder aux colonnes par nom
-    cursor = conn.cursor()
+# Un moteur par processus worker (chargement de l'index une seule fois)
+_engine = None
+
+def _init_worker():
+    global _engine
+    _engine = TrildasaEngine()
+
+def _generate_vector(row_dict):
+    return _engine.generate_vector(row_dict)
+
+def _write_chunk(conn, row_dicts, vectors, updated):
+    """Écrit les vecteurs d'une tranche (une transaction). Retourne le total."""
+    updates = []
+    for row_dict, vector in zip(row_dicts, vectors):
+        if vector:
+            updates.append((_dumps(vector), row_dict['id']))
+            
+            if (updated + len(updates)) % 100 == 0:
+                print(f"  {updated + len(updates)} segments traités...")
+    
+    with conn:
+        conn.executemany(UPDATE_SQL, updates)
+    return updated + len(updates)
+
+def migrate_batch(conn: sqlite3.Connection = None):
+    """
+    Migre un lot de BATCH_SIZE segments. Réutilisable (ex. appel périodique) :
+    les connexions du thread restent ouvertes entre les appels.
+    """
+    conn = conn or get_conn()
     
-    # Sélectionner 1000 segments sans vecteur
-    cursor.execute("""
-        SELECT * FROM metadata 
-        WHERE vecteur_trildasa IS NULL OR vecteur_trildasa = ''
-        LIMIT ?
-    """, (BATCH_SIZE,))
+    # Lecture sur une connexion dédiée : en WAL, son instantané n'est pas
+    # affecté par les commits par tranche de la connexion d'écriture
+    cursor = _get_reader().cursor()
     
-    rows = cursor.fetchall()
-    print(f"Segments à traiter: {len(rows)}")
+    # Sélectionner les segments sans vecteur
+    cursor.execute(SELECT_SQL, (BATCH_SIZE,))
     
+    # Tranche N calculée par le pool pendant la lecture de la tranche N+1
     updated = 0
-    for row in rows:
-        row_dict = dict(row)
-        vector = engine.generate_vector(row_dict)
-        
-        if vector:
-            cursor.execute("""
-                UPDATE metadata 
-                SET vecteur_trildasa = ? 
-                WHERE id = ?
-            """, (json.dumps(vector), row_dict['id']))
-            updated += 1
+    pending = None
+    with ProcessPoolExecutor(initializer=_init_worker) as pool:
+        while True:
+            chunk = cursor.fetchmany(FETCH_SIZE)
+            submitted = None
+            if chunk:
+                row_dicts = [dict(row) for row in chunk]
+                submitted = (row_dicts, pool.map(_generate_vector, row_dicts, chunksize=32))
             
-            if updated % 100 == 0:
-                print(f"  {updated} segments traités...")
+            if pending:
+                updated = _write_chunk(conn, *pending, updated)
+            if submitted is None:
+                break
+            pending = submitted
     
-    conn.commit()
-    conn.close()
+    cursor.close()  # Libère l'instantané de lecture
     print(f"\n✅ Migration terminée: {updated} vecteurs générés")
 
 if __name__ == "__main__":
-    migrate_batch()
\ No newline at end of file
+    migrate_batch()
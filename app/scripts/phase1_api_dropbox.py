@@ -19,12 +19,19 @@ Date: 2026-01-16
 
 import os
 import sqlite3
+import sys
 import time
 import logging
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.sqlite_tuning import tune_sqlite
+
 # Charger les variables d'environnement
 env_path = Path.home() / "Dropbox" / "aiterego" / ".env"
 load_dotenv(env_path)
@@ -51,19 +58,67 @@ except ImportError:
 DB_DIR = Path.home() / "Dropbox" / "aiterego_memory" / "index"
 DB_PATH = DB_DIR / "file_index.db"
 BATCH_SIZE = 2000  # Nombre d'entrées Dropbox par requête (max 2000)
-COMMIT_EVERY = 1000  # Commit DB tous les N fichiers
+PREFETCH_PAGES = 4  # Pages Dropbox lues d'avance pendant l'insertion SQLite
+
+# Insertion d'un fichier (une page Dropbox = un executemany, un commit).
+# Upsert sur file_id : l'enrichissement de la phase 2 (summary, keywords,
+# content_hash_enriched...) est conservé; status reste 'enriched' tant que le
+# contenu n'a pas changé, tout autre statut (error, skipped...) repasse à 'pending'
+INSERT_FILE_SQL = '''
+    INSERT INTO files (
+        file_id, path_display, path_lower, name, extension,
+        size, content_hash, server_modified, client_modified,
+        rev, is_downloadable, status, indexed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
+    ON CONFLICT(file_id) DO UPDATE SET
+        path_display = excluded.path_display,
+        path_lower = excluded.path_lower,
+        name = excluded.name,
+        extension = excluded.extension,
+        size = excluded.size,
+        content_hash = excluded.content_hash,
+        server_modified = excluded.server_modified,
+        client_modified = excluded.client_modified,
+        rev = excluded.rev,
+        is_downloadable = excluded.is_downloadable,
+        status = CASE WHEN files.content_hash IS excluded.content_hash
+                           AND files.status = 'enriched'
+                      THEN files.status ELSE 'pending' END,
+        indexed_at = excluded.indexed_at
+'''
+
+# Triggers de synchronisation FTS5 : retirés pendant le chargement, recréés
+# (avec un 'rebuild') par finalize_indexes_and_fts
+FTS_TRIGGERS = ("files_ai", "files_ad", "files_au")
 
 
 def init_db() -> sqlite3.Connection:
-    """Initialise la base de données avec le nouveau schéma (file_id comme clé)."""
+    """
+    Initialise la base de données avec le nouveau schéma (file_id comme clé).
+    La table files est conservée d'un scan à l'autre (upsert) ; index et FTS5
+    sont (re)construits après le chargement (voir finalize_indexes_and_fts).
+    """
     DB_DIR.mkdir(parents=True, exist_ok=True)
     
     conn = sqlite3.connect(str(DB_PATH))
+    tune_sqlite(conn)
+    init_base_table(conn)
+    logger.info(f"Base de données initialisée: {DB_PATH}")
+    return conn
+
+
+def init_base_table(conn: sqlite3.Connection):
+    """Crée la table files si absente et retire les triggers FTS5 le temps du chargement."""
     cursor = conn.cursor()
     
-    # Supprimer l'ancienne table si elle existe (migration)
-    cursor.execute("DROP TABLE IF EXISTS files_fts")
-    cursor.execute("DROP TABLE IF EXISTS files")
+    # Ancienne table du scan local (clé = path, sans file_id) : migration
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(files)")}
+    if columns and "file_id" not in columns:
+        cursor.execute("DROP TABLE IF EXISTS files_fts")
+        cursor.execute("DROP TABLE IF EXISTS files")
+    
+    for trigger in FTS_TRIGGERS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
     
     # Nouvelle table avec file_id comme identifiant unique
     cursor.execute('''
@@ -88,10 +143,26 @@ def init_db() -> sqlite3.Connection:
             status TEXT DEFAULT 'pending',
             indexed_at TEXT,
             enriched_at TEXT,
+            content_hash_enriched TEXT,
             error_message TEXT
         )
     ''')
     
+    # Bases créées avant content_hash_enriched
+    if columns and "file_id" in columns and "content_hash_enriched" not in columns:
+        cursor.execute("ALTER TABLE files ADD COLUMN content_hash_enriched TEXT")
+    
+    conn.commit()
+
+
+def finalize_indexes_and_fts(conn: sqlite3.Connection):
+    """
+    Crée index, FTS5 et triggers une fois la table chargée : l'index FTS5 est
+    construit en une passe (rebuild) plutôt que par un trigger à chaque INSERT.
+    Les triggers gardent ensuite FTS5 synchronisé avec les mises à jour de la phase 2.
+    """
+    cursor = conn.cursor()
+    
     # Index pour performances
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_path ON files(path_lower)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_files_extension ON files(extension)')
@@ -111,6 +182,9 @@ def init_db() -> sqlite3.Connection:
         )
     ''')
     
+    # Indexation FTS5 en une passe depuis la table de contenu
+    cursor.execute("INSERT INTO files_fts(files_fts) VALUES('rebuild')")
+    
     # Triggers pour synchroniser FTS5
     cursor.execute('''
         CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
@@ -136,8 +210,7 @@ def init_db() -> sqlite3.Connection:
     ''')
     
     conn.commit()
-    logger.info(f"Base de données initialisée: {DB_PATH}")
-    return conn
+    logger.info("Index et FTS5 construits")
 
 
 def get_dropbox_client() -> dropbox.Dropbox:
@@ -161,6 +234,50 @@ def get_dropbox_client() -> dropbox.Dropbox:
         raise ValueError(f"Token Dropbox invalide: {e}")
 
 
+def iter_pages_dropbox(dbx: dropbox.Dropbox):
+    """
+    Parcourt le curseur list_folder dans un thread producteur.
+    Le curseur est chaîné (page N+1 exige la page N) : on ne parallélise pas
+    les appels, on les recouvre avec l'insertion SQLite du consommateur.
+    Les erreurs du producteur sont relancées côté consommateur.
+    """
+    pages = queue.Queue(maxsize=PREFETCH_PAGES)
+    fin = object()
+    arret = threading.Event()
+    
+    def deposer(item) -> bool:
+        while not arret.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def producteur():
+        try:
+            result = dbx.files_list_folder("", recursive=True, limit=BATCH_SIZE)
+            while deposer(result) and result.has_more:
+                result = dbx.files_list_folder_continue(result.cursor)
+            deposer(fin)
+        except Exception as e:
+            deposer(e)
+    
+    thread = threading.Thread(target=producteur, name="dropbox-pages", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is fin:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Consommateur interrompu : libérer le producteur
+        arret.set()
+
+
 def scan_dropbox_api(conn: sqlite3.Connection, dbx: dropbox.Dropbox):
     """Scanne tout le Dropbox via l'API et enregistre dans la DB."""
     cursor = conn.cursor()
@@ -176,65 +293,67 @@ def scan_dropbox_api(conn: sqlite3.Connection, dbx: dropbox.Dropbox):
     indexed_at = datetime.now().isoformat()
     
     try:
-        # Premier appel - liste récursive depuis la racine
-        result = dbx.files_list_folder("", recursive=True, limit=BATCH_SIZE)
-        
-        while True:
-            # Traiter les entrées
+        # Liste récursive depuis la racine, page suivante lue pendant l'insertion
+        for result in iter_pages_dropbox(dbx):
+            # Traiter les entrées : lignes d'une page, insérées en un seul executemany
+            rows = []
             for entry in result.entries:
                 if isinstance(entry, FileMetadata):
                     # C'est un fichier
                     ext = Path(entry.name).suffix.lower() if '.' in entry.name else ''
-                    
-                    try:
-                        cursor.execute('''
-                            INSERT OR REPLACE INTO files (
-                                file_id, path_display, path_lower, name, extension,
-                                size, content_hash, server_modified, client_modified,
-                                rev, is_downloadable, status, indexed_at
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)
-                        ''', (
-                            entry.id,
-                            entry.path_display,
-                            entry.path_lower,
-                            entry.name,
-                            ext,
-                            entry.size,
-                            entry.content_hash,
-                            entry.server_modified.isoformat() if entry.server_modified else None,
-                            entry.client_modified.isoformat() if entry.client_modified else None,
-                            entry.rev,
-                            1 if entry.is_downloadable else 0,
-                            indexed_at
-                        ))
-                        total_files += 1
-                        
-                    except Exception as e:
-                        errors += 1
-                        logger.warning(f"Erreur insertion {entry.path_display}: {e}")
+                    rows.append((
+                        entry.id,
+                        entry.path_display,
+                        entry.path_lower,
+                        entry.name,
+                        ext,
+                        entry.size,
+                        entry.content_hash,
+                        entry.server_modified.isoformat() if entry.server_modified else None,
+                        entry.client_modified.isoformat() if entry.client_modified else None,
+                        entry.rev,
+                        1 if entry.is_downloadable else 0,
+                        indexed_at
+                    ))
                 
                 elif isinstance(entry, FolderMetadata):
                     total_folders += 1
-                
-                # Commit périodique
-                if total_files % COMMIT_EVERY == 0 and total_files > 0:
-                    conn.commit()
-                    logger.info(f"Progression: {total_files} fichiers, {total_folders} dossiers...")
             
-            # Vérifier s'il y a plus de résultats
-            if not result.has_more:
-                break
+            # Une transaction par page
+            try:
+                cursor.execute('BEGIN')
+                cursor.executemany(INSERT_FILE_SQL, rows)
+                conn.commit()
+                total_files += len(rows)
+            except Exception as e:
+                # Page rejetée : ligne par ligne pour isoler les entrées fautives
+                conn.rollback()
+                logger.warning(f"Erreur insertion par lot ({e}), reprise ligne par ligne")
+                for row in rows:
+                    try:
+                        cursor.execute(INSERT_FILE_SQL, row)
+                        total_files += 1
+                    except Exception as e:
+                        errors += 1
+                        logger.warning(f"Erreur insertion {row[1]}: {e}")
+                conn.commit()
             
-            # Continuer avec le curseur
-            result = dbx.files_list_folder_continue(result.cursor)
-        
-        # Commit final
-        conn.commit()
+            logger.info(f"Progression: {total_files} fichiers, {total_folders} dossiers...")
         
     except ApiError as e:
         logger.error(f"Erreur API Dropbox: {e}")
         raise
     
+    # Scan complet : les fichiers non revus ont disparu de Dropbox.
+    # Une ligne en échec n'a pas reçu le nouvel indexed_at : pas de purge
+    if errors:
+        removed = 0
+        logger.warning(f"{errors} insertion(s) en échec : purge des fichiers supprimés reportée")
+    else:
+        cursor.execute("DELETE FROM files WHERE indexed_at IS NOT ?", (indexed_at,))
+        removed = cursor.rowcount
+        conn.commit()
+    
     duration = time.time() - start_time
     
     logger.info("=" * 60)
@@ -243,6 +362,7 @@ def scan_dropbox_api(conn: sqlite3.Connection, dbx: dropbox.Dropbox):
     logger.info(f"Durée: {duration:.2f} secondes")
     logger.info(f"Fichiers indexés: {total_files}")
     logger.info(f"Dossiers traversés: {total_folders}")
+    logger.info(f"Fichiers retirés (supprimés de Dropbox): {removed}")
     logger.info(f"Erreurs: {errors}")
     logger.info(f"Base de données: {DB_PATH}")
     
@@ -293,11 +413,16 @@ def main():
     conn = init_db()
     
     try:
-        # Connexion Dropbox
-        dbx = get_dropbox_client()
-        
-        # Scanner
-        total = scan_dropbox_api(conn, dbx)
+        try:
+            # Connexion Dropbox
+            dbx = get_dropbox_client()
+            
+            # Scanner (table sans triggers FTS5), index + FTS5 en une passe ensuite
+            total = scan_dropbox_api(conn, dbx)
+        finally:
+            # Même après un échec : index, FTS5 et triggers pour la phase 2
+            conn.rollback()
+            finalize_indexes_and_fts(conn)
         
         # Statistiques
         if total > 0:
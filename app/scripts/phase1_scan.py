@@ -1,18 +1,34 @@
 import os
 import sqlite3
+import sys
 import time
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.sqlite_tuning import tune_sqlite
+
 # Configuration des chemins
 DROPBOX_PATH = os.path.expanduser("~/Dropbox")
 DB_DIR = os.path.expanduser("~/Dropbox/aiterego_memory/index")
 DB_PATH = os.path.join(DB_DIR, "file_index.db")
 
+# Dossiers système jamais parcourus (en plus des dossiers cachés)
+IGNORED_DIRS = frozenset({'node_modules', '__pycache__'})
+
+# Insertion par lots : un executemany et un commit par INSERT_BATCH fichiers
+INSERT_BATCH = 5000
+INSERT_FILE_SQL = '''
+    INSERT OR IGNORE INTO files (path, name, extension, size, mtime)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
 def init_db():
     # Créer le dossier d'index s'il n'existe pas
     os.makedirs(DB_DIR, exist_ok=True)
     
     conn = sqlite3.connect(DB_PATH)
+    tune_sqlite(conn)
     cursor = conn.cursor()
     
     # Table principale (Métadonnées techniques)
@@ -52,40 +68,81 @@ def init_db():
     conn.commit()
     return conn
 
-def scan_dropbox(conn):
+def _extension(name):
+    # Équivalent de Path(name).suffix.lower(), sans construire de Path
+    i = name.rfind('.')
+    if 0 < i < len(name) - 1:
+        return name[i:].lower()
+    return ''
+
+def _flush(conn, buf):
+    # Un lot = une transaction (commit par lot); si le lot échoue (ex. chemin
+    # non UTF-8 issu de os.scandir), reprise ligne par ligne
     cursor = conn.cursor()
+    try:
+        cursor.execute('BEGIN')
+        cursor.executemany(INSERT_FILE_SQL, buf)
+        conn.commit()
+        return len(buf)
+    except Exception as e:
+        conn.rollback()
+        print(f"Erreur insertion par lot ({e}), reprise ligne par ligne")
+    count = 0
+    for row in buf:
+        try:
+            cursor.execute(INSERT_FILE_SQL, row)
+            count += 1
+        except Exception as e:
+            print(f"Erreur sur {row[0]!r}: {e}")
+    conn.commit()
+    return count
+
+def scan_dropbox(conn):
     start_time = time.time()
     count = 0
     
+    buf = []
+
     print(f"Démarrage du scan technique : {DROPBOX_PATH}")
-    
-    for root, dirs, files in os.walk(DROPBOX_PATH):
-        # Ignorer les dossiers système et cachés
-        dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__']]
-        
-        for file in files:
-            if file.startswith('.'): continue
-            
-            full_path = os.path.join(root, file)
-            p = Path(full_path)
-            
-            try:
-                stat = p.stat()
-                cursor.execute('''
-                    INSERT OR IGNORE INTO files (path, name, extension, size, mtime)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (full_path, p.name, p.suffix.lower(), stat.st_size, stat.st_mtime))
-                
-                count += 1
-                if count % 1000 == 0:
-                    conn.commit()
+
+    # Parcours explicite par os.scandir : DirEntry donne type et nom sans
+    # repasser par Path, un seul stat() par fichier
+    stack = [DROPBOX_PATH]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue  # Comme os.walk : dossier illisible ignoré
+        with it:
+            for entry in it:
+                # Ignorer les fichiers et dossiers cachés
+                if entry.name.startswith('.'):
+                    continue
+
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # Ignorer les dossiers système; liens vers dossiers non suivis
+                    if entry.name not in IGNORED_DIRS and not entry.is_symlink():
+                        stack.append(entry.path)
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except Exception as e:
+                    print(f"Erreur sur {entry.path}: {e}")
+                    continue
+
+                buf.append((entry.path, entry.name, _extension(entry.name), stat.st_size, stat.st_mtime))
+                if len(buf) >= INSERT_BATCH:
+                    count += _flush(conn, buf)
+                    buf.clear()
                     print(f"Fichiers répertoriés : {count}...")
-                    
-            except Exception as e:
-                print(f"Erreur sur {full_path}: {e}")
-                continue
 
-    conn.commit()
+    if buf:
+        count += _flush(conn, buf)
     duration = time.time() - start_time
     print(f"Phase 1 terminée en {duration:.2f} secondes.")
     print(f"Total : {count} fichiers enregistrés dans file_index.db.")
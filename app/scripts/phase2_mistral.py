@@ -25,17 +25,24 @@ Date: 2026-01-16
 import os
 import sys
 import json
+import re
 import sqlite3
 import time
 import logging
 import argparse
 import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.sqlite_tuning import tune_sqlite
+
 # Charger les variables d'environnement
 env_path = Path.home() / "Dropbox" / "aiterego" / ".env"
 load_dotenv(env_path)
@@ -57,9 +64,18 @@ except ImportError:
     DROPBOX_AVAILABLE = False
     logger.warning("dropbox SDK non disponible - téléchargement cloud désactivé")
 
+# orjson optionnel (parsing plus rapide des réponses Ollama)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 # Import requests pour Ollama
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
@@ -71,6 +87,7 @@ DB_PATH = Path.home() / "Dropbox" / "aiterego_memory" / "index" / "file_index.db
 OLLAMA_URL = "http://localhost:11434/api/generate"
 OLLAMA_MODEL = "mistral"
 TEMP_DIR = Path(tempfile.gettempdir()) / "moss_phase2"
+LOCAL_DROPBOX = str(Path.home() / "Dropbox")
 
 # Extensions à traiter (fichiers textuels)
 TEXT_EXTENSIONS = {
@@ -82,6 +99,94 @@ TEXT_EXTENSIONS = {
 # Limites
 MAX_CONTENT_SIZE = 50000  # Caractères max à envoyer à Mistral
 TIMEOUT_SECONDS = 120  # Timeout par fichier
+MISTRAL_WORKERS = 4  # Requêtes Ollama simultanées (côté serveur : OLLAMA_NUM_PARALLEL)
+DOWNLOAD_WORKERS = 16  # Lectures/téléchargements de contenu simultanés
+PREFETCH_FILES = 32  # Fichiers dont le contenu est lu d'avance
+BINARY_SNIFF_BYTES = 4096  # Octets inspectés pour détecter un fichier binaire
+MAX_READ_BYTES = MAX_CONTENT_SIZE * 4 + 4  # Couvre MAX_CONTENT_SIZE caractères UTF-8 (+ marge de troncature)
+
+# Petits fichiers regroupés dans un seul prompt (un tableau JSON en réponse)
+PACK_FILE_CHARS = 4000  # Taille max d'un fichier regroupable
+PACK_MAX_FILES = 5  # Fichiers par prompt (contenu cumulé <= 20 000 caractères)
+NUM_PREDICT_PER_FILE = 300  # Tokens de réponse par fichier d'un lot
+
+
+# Mises à jour de process_files, accumulées puis appliquées par executemany
+UPDATE_FLUSH_ROWS = 200
+UPDATE_STATUS_SQL = "UPDATE files SET status = ?, enriched_at = ? WHERE id = ?"
+UPDATE_ERROR_SQL = "UPDATE files SET status = 'error', error_message = ?, enriched_at = ? WHERE id = ?"
+UPDATE_ENRICHED_SQL = '''
+    UPDATE files SET 
+        summary = ?,
+        domain = ?,
+        keywords = ?,
+        roget_codes = ?,
+        importance = ?,
+        status = 'enriched',
+        enriched_at = ?,
+        content_hash_enriched = content_hash
+    WHERE id = ?
+'''
+
+
+# Session HTTP Ollama partagée : connexions keep-alive réutilisées par les
+# threads Mistral, reprise automatique si le serveur est indisponible
+# (pas de reprise sur timeout de lecture : une génération peut durer TIMEOUT_SECONDS)
+OLLAMA_SESSION = requests.Session()
+OLLAMA_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MISTRAL_WORKERS,
+    max_retries=Retry(
+        total=3,
+        read=0,
+        backoff_factor=1.0,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,
+        allowed_methods=None
+    )
+))
+
+# Parties fixes du prompt d'enrichissement (concaténées autour du contenu)
+PROMPT_HEADER = """Analyse ce fichier et réponds en JSON valide uniquement.
+
+FICHIER: """
+
+PROMPT_JSON = """{
+    "summary": "Résumé en 1-2 phrases du contenu principal",
+    "domain": "personnel|recherche|technique|administratif|creatif|media",
+    "keywords": ["mot1", "mot2", "mot3"],
+    "roget_primary": "XX-XXXX-XXXX",
+    "importance": 3
+}"""
+
+PROMPT_RULES = """Règles:
+- domain: choisis UN seul parmi les options
+- keywords: 3-5 mots-clés pertinents
+- roget_primary: code Roget principal (ex: "04-0110-0010" pour cognition)
+- importance: 1 (trivial) à 5 (critique)
+- summary: en français, concis
+"""
+
+PROMPT_FOOTER = (
+    "\n---\n\nRéponds UNIQUEMENT avec ce JSON (pas de texte avant/après):\n"
+    + PROMPT_JSON + "\n\n" + PROMPT_RULES
+)
+
+# Objet JSON dans la réponse : du premier '{' au dernier '}'
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+
+
+def ensure_schema(conn: sqlite3.Connection):
+    """
+    Ajoute content_hash_enriched aux bases créées avant son introduction.
+    La colonne garde le content_hash Dropbox du contenu effectivement enrichi.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+    if "content_hash_enriched" not in columns:
+        conn.execute("ALTER TABLE files ADD COLUMN content_hash_enriched TEXT")
+        conn.commit()
+        logger.info("Colonne content_hash_enriched ajoutée")
 
 
 def get_dropbox_client() -> Optional[dropbox.Dropbox]:
@@ -98,10 +203,12 @@ def get_dropbox_client() -> Optional[dropbox.Dropbox]:
         return None
     
     try:
+        # Client partagé par les threads de téléchargement : pool HTTP à leur taille
         dbx = dropbox.Dropbox(
             oauth2_refresh_token=refresh_token,
             app_key=app_key,
-            app_secret=app_secret
+            app_secret=app_secret,
+            session=dropbox.create_session(max_connections=DOWNLOAD_WORKERS)
         )
         dbx.users_get_current_account()  # Test connexion
         return dbx
@@ -117,14 +224,9 @@ def download_file_content(dbx: dropbox.Dropbox, path_lower: str, max_retries: in
             metadata, response = dbx.files_download(path_lower)
             content = response.content
             
-            # Essayer de décoder en texte
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    return content.decode(encoding)
-                except UnicodeDecodeError:
-                    continue
-            
-            return None  # Fichier binaire
+            if is_binary(content):
+                return None  # Fichier binaire
+            return decode_text(content)
             
         except ApiError as e:
             logger.debug(f"Erreur téléchargement {path_lower}: {e}")
@@ -140,23 +242,53 @@ def download_file_content(dbx: dropbox.Dropbox, path_lower: str, max_retries: in
     return None
 
 
+def is_binary(data: bytes) -> bool:
+    """Heuristique : un octet nul dans les premiers Ko signale un fichier binaire."""
+    return b'\x00' in data[:BINARY_SNIFF_BYTES]
+
+
+def decode_text(data: bytes, truncated: bool = False) -> str:
+    """Décode en UTF-8, sinon en latin-1 (qui ne peut pas échouer)."""
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # Lecture tronquée au milieu d'un caractère multi-octets
+        if truncated and e.reason == 'unexpected end of data':
+            return data[:e.start].decode('utf-8')
+        return data.decode('latin-1')
+
+
 def read_local_file(path: str) -> Optional[str]:
-    """Lit un fichier local si disponible."""
+    """
+    Lit un fichier local si disponible (None s'il est absent).
+    Un fichier binaire présent localement donne '' : inutile de le télécharger.
+    """
     # Convertir le path Dropbox en path local
-    local_path = Path.home() / "Dropbox" / path.lstrip('/')
+    local_path = os.path.join(LOCAL_DROPBOX, path.lstrip('/'))
     
-    if not local_path.exists():
+    try:
+        fd = os.open(local_path, os.O_RDONLY)
+    except OSError:
         return None
     
     try:
-        for encoding in ['utf-8', 'latin-1', 'cp1252']:
-            try:
-                return local_path.read_text(encoding=encoding)
-            except UnicodeDecodeError:
-                continue
-        return None
-    except Exception:
+        head = os.read(fd, BINARY_SNIFF_BYTES)
+        if is_binary(head):
+            return ""
+        chunks = [head]
+        remaining = MAX_READ_BYTES - len(head)
+        while remaining > 0:
+            chunk = os.read(fd, remaining)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+    except OSError:
         return None
+    finally:
+        os.close(fd)
+    
+    return decode_text(b''.join(chunks), truncated=remaining <= 0)
 
 
 def extract_text_from_pdf(content: bytes) -> Optional[str]:
@@ -197,10 +329,42 @@ def get_file_content(dbx: Optional[dropbox.Dropbox], path_lower: str, path_displ
     return content
 
 
-def call_mistral(prompt: str) -> Optional[str]:
+def iter_file_contents(dbx: Optional[dropbox.Dropbox], rows):
+    """
+    Génère (row, content) dans l'ordre des rows, le contenu étant lu d'avance
+    (PREFETCH_FILES fichiers, DOWNLOAD_WORKERS threads) pendant que Mistral travaille.
+    content vaut None si l'extension n'est pas supportée ou le contenu absent.
+    """
+    pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="dropbox-dl")
+    window = deque()
+    rows = iter(rows)
+    
+    def submit_next() -> bool:
+        row = next(rows, None)
+        if row is None:
+            return False
+        _, _, path_lower, path_display, _, extension = row
+        if extension and extension.lower() not in TEXT_EXTENSIONS:
+            window.append((row, None))
+        else:
+            window.append((row, pool.submit(get_file_content, dbx, path_lower, path_display, extension)))
+        return True
+    
+    try:
+        while len(window) < PREFETCH_FILES and submit_next():
+            pass
+        while window:
+            row, future = window.popleft()
+            submit_next()
+            yield row, future.result() if future else None
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def call_mistral(prompt: str, num_predict: int = 1000) -> Optional[str]:
     """Appelle Mistral via Ollama."""
     try:
-        response = requests.post(
+        response = OLLAMA_SESSION.post(
             OLLAMA_URL,
             json={
                 "model": OLLAMA_MODEL,
@@ -208,14 +372,14 @@ def call_mistral(prompt: str) -> Optional[str]:
                 "stream": False,
                 "options": {
                     "temperature": 0.3,
-                    "num_predict": 1000
+                    "num_predict": num_predict
                 }
             },
             timeout=TIMEOUT_SECONDS
         )
         
         if response.status_code == 200:
-            return response.json().get("response", "")
+            return json_loads(response.content).get("response", "")
         else:
             logger.warning(f"Ollama error {response.status_code}")
             return None
@@ -231,32 +395,12 @@ def call_mistral(prompt: str) -> Optional[str]:
 def enrich_file(content: str, filename: str, extension: str) -> Dict[str, Any]:
     """Enrichit un fichier avec Mistral."""
     
-    prompt = f"""Analyse ce fichier et réponds en JSON valide uniquement.
-
-FICHIER: {filename}
-TYPE: {extension}
-
-CONTENU:
----
-{content[:30000]}
----
-
-Réponds UNIQUEMENT avec ce JSON (pas de texte avant/après):
-{{
-    "summary": "Résumé en 1-2 phrases du contenu principal",
-    "domain": "personnel|recherche|technique|administratif|creatif|media",
-    "keywords": ["mot1", "mot2", "mot3"],
-    "roget_primary": "XX-XXXX-XXXX",
-    "importance": 3
-}}
-
-Règles:
-- domain: choisis UN seul parmi les options
-- keywords: 3-5 mots-clés pertinents
-- roget_primary: code Roget principal (ex: "04-0110-0010" pour cognition)
-- importance: 1 (trivial) à 5 (critique)
-- summary: en français, concis
-"""
+    prompt = (
+        PROMPT_HEADER + filename
+        + "\nTYPE: " + extension
+        + "\n\nCONTENU:\n---\n" + content[:30000]
+        + PROMPT_FOOTER
+    )
 
     response = call_mistral(prompt)
     
@@ -269,12 +413,10 @@ Règles:
         response = response.strip()
         
         # Trouver le JSON dans la réponse
-        start = response.find('{')
-        end = response.rfind('}') + 1
+        match = JSON_OBJECT_RE.search(response)
         
-        if start >= 0 and end > start:
-            json_str = response[start:end]
-            return json.loads(json_str)
+        if match:
+            return json_loads(match.group(0))
         else:
             return {"error": "JSON non trouvé", "raw": response[:200]}
             
@@ -282,14 +424,107 @@ Règles:
         return {"error": f"JSON invalide: {e}", "raw": response[:200]}
 
 
+def enrich_batch(items: List[tuple]) -> List[Dict[str, Any]]:
+    """
+    Enrichit plusieurs petits fichiers (content, filename, extension) en un seul
+    appel Mistral. Retombe sur enrich_file par fichier si le tableau JSON est
+    absent, invalide ou de la mauvaise longueur.
+    """
+    if len(items) == 1:
+        return [enrich_file(*items[0])]
+    
+    parts = [f"Analyse ces {len(items)} fichiers et réponds en JSON valide uniquement.\n"]
+    for i, (content, filename, extension) in enumerate(items, 1):
+        parts.append(
+            f"\nFICHIER {i}: {filename}\nTYPE: {extension}\n\nCONTENU:\n---\n{content}\n---\n"
+        )
+    parts.append(
+        f"\nRéponds UNIQUEMENT avec un tableau JSON de {len(items)} objets, "
+        "un par fichier et dans le même ordre (pas de texte avant/après):\n"
+        "[\n" + PROMPT_JSON + ",\n...\n]\n\n" + PROMPT_RULES
+    )
+    
+    response = call_mistral("".join(parts), num_predict=NUM_PREDICT_PER_FILE * len(items))
+    
+    if response:
+        match = JSON_ARRAY_RE.search(response)
+        try:
+            results = json_loads(match.group(0)) if match else None
+        except json.JSONDecodeError:
+            results = None
+        if (isinstance(results, list) and len(results) == len(items)
+                and all(isinstance(r, dict) for r in results)):
+            return results
+    
+    logger.warning(f"Lot de {len(items)} fichiers non décodé, reprise fichier par fichier")
+    return [enrich_file(*item) for item in items]
+
+
+def enrichment_update(file_id_db: int, result: Dict[str, Any]) -> Tuple[str, tuple]:
+    """Prépare l'UPDATE (requête, paramètres) correspondant au résultat de enrich_file."""
+    if "error" in result:
+        return UPDATE_ERROR_SQL, (result.get("error", "")[:500], datetime.now().isoformat(), file_id_db)
+    
+    # Préparer les données
+    keywords = result.get("keywords", [])
+    if isinstance(keywords, list):
+        keywords = json.dumps(keywords, ensure_ascii=False)
+    elif not isinstance(keywords, str):
+        keywords = ""
+    
+    domain = result.get("domain", "")
+    if isinstance(domain, list):
+        domain = domain[0] if domain else ""
+    elif not isinstance(domain, str):
+        domain = ""
+    
+    summary = result.get("summary", "")
+    if not isinstance(summary, str):
+        summary = str(summary) if summary else ""
+    
+    roget = result.get("roget_primary", "")
+    if not isinstance(roget, str):
+        roget = str(roget) if roget else ""
+    
+    importance = result.get("importance", 3)
+    if not isinstance(importance, int):
+        try:
+            importance = int(importance)
+        except:
+            importance = 3
+
+    return UPDATE_ENRICHED_SQL, (
+        summary,
+        domain,
+        keywords,
+        roget,
+        importance,
+        datetime.now().isoformat(),
+        file_id_db
+    )
+
+
 def process_files(conn: sqlite3.Connection, dbx: Optional[dropbox.Dropbox], 
                   limit: Optional[int] = None, extensions: Optional[set] = None):
     """Traite les fichiers en attente."""
     
     cursor = conn.cursor()
     
-    # Construire la requête
-    query = "SELECT id, file_id, path_lower, path_display, name, extension FROM files WHERE status = 'pending'"
+    # Fichiers remis en attente mais inchangés depuis leur enrichissement
+    cursor.execute('''
+        UPDATE files SET status = 'enriched'
+        WHERE status = 'pending' AND content_hash_enriched = content_hash
+    ''')
+    if cursor.rowcount > 0:
+        logger.info(f"Inchangés depuis le dernier enrichissement: {cursor.rowcount}")
+    conn.commit()
+    
+    # Construire la requête (seul le contenu modifié repasse par Mistral)
+    query = (
+        "SELECT id, file_id, path_lower, path_display, name, extension FROM files "
+        "WHERE status = 'pending' "
+        "AND (content_hash_enriched IS NULL OR content_hash_enriched != content_hash)"
+    )
     params = []
     
     if extensions:
@@ -300,10 +535,8 @@ def process_files(conn: sqlite3.Connection, dbx: Optional[dropbox.Dropbox],
     if limit:
         query += f" LIMIT {limit}"
     
-    cursor.execute(query, params)
-    files = cursor.fetchall()
-    
-    total = len(files)
+    cursor.execute(f"SELECT COUNT(*) FROM ({query})", params)
+    total = cursor.fetchone()[0]
     logger.info(f"Fichiers à traiter: {total}")
     
     if total == 0:
@@ -317,102 +550,102 @@ def process_files(conn: sqlite3.Connection, dbx: Optional[dropbox.Dropbox],
     
     start_time = time.time()
     
-    for row in files:
-        file_id_db, file_id, path_lower, path_display, name, extension = row
-        
-        processed += 1
-        
-        # Afficher le fichier en cours
-        logger.info(f"[{processed}/{total}] {name}")
-        
-        # Skip si extension non supportée
-        if extension and extension.lower() not in TEXT_EXTENSIONS:
-            cursor.execute(
-                "UPDATE files SET status = 'skipped', enriched_at = ? WHERE id = ?",
-                (datetime.now().isoformat(), file_id_db)
-            )
-            skipped += 1
-            continue
-        
-        # Récupérer le contenu
-        content = get_file_content(dbx, path_lower, path_display, extension)
-        
-        if not content:
-            cursor.execute(
-                "UPDATE files SET status = 'no_content', enriched_at = ? WHERE id = ?",
-                (datetime.now().isoformat(), file_id_db)
-            )
-            skipped += 1
-            continue
-        
-        # Enrichir avec Mistral
-        result = enrich_file(content, name, extension)
-        
-        if "error" in result:
-            cursor.execute(
-                "UPDATE files SET status = 'error', error_message = ?, enriched_at = ? WHERE id = ?",
-                (result.get("error", "")[:500], datetime.now().isoformat(), file_id_db)
-            )
-            errors += 1
-        else:
-             # Préparer les données
-            keywords = result.get("keywords", [])
-            if isinstance(keywords, list):
-                keywords = json.dumps(keywords, ensure_ascii=False)
-            elif not isinstance(keywords, str):
-                keywords = ""
+    # Lecture en flux sur une connexion dédiée : mémoire constante, et les
+    # UPDATE de conn ne modifient pas la table sous le curseur (snapshot WAL)
+    reader = sqlite3.connect(str(DB_PATH))
+    files = reader.cursor()
+    files.arraysize = 1000
+    files.execute(query, params)
+    
+    # Appels Mistral en parallèle; le contenu est lu et la DB écrite ici seulement
+    pool = ThreadPoolExecutor(max_workers=MISTRAL_WORKERS, thread_name_prefix="mistral")
+    in_flight = {}  # future -> ids des fichiers du lot
+    pack, pack_ids = [], []  # Petits fichiers en attente de regroupement
+    updates = {UPDATE_STATUS_SQL: [], UPDATE_ERROR_SQL: [], UPDATE_ENRICHED_SQL: []}
+    pending_updates = 0
+    
+    def queue_update(sql, params):
+        nonlocal pending_updates
+        updates[sql].append(params)
+        pending_updates += 1
+        if pending_updates >= UPDATE_FLUSH_ROWS:
+            flush_updates()
+    
+    def flush_updates():
+        # Une transaction, un executemany par requête
+        nonlocal pending_updates
+        for sql, rows in updates.items():
+            if rows:
+                cursor.executemany(sql, rows)
+                rows.clear()
+        conn.commit()
+        pending_updates = 0
+    
+    def collect(done):
+        nonlocal enriched, errors
+        for future in done:
+            for file_id_db, result in zip(in_flight.pop(future), future.result()):
+                sql, params = enrichment_update(file_id_db, result)
+                queue_update(sql, params)
+                if sql is UPDATE_ENRICHED_SQL:
+                    enriched += 1
+                else:
+                    errors += 1
+    
+    def submit(items, ids):
+        # Au plus MISTRAL_WORKERS requêtes en vol
+        in_flight[pool.submit(enrich_batch, items)] = ids
+        if len(in_flight) >= MISTRAL_WORKERS:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+    
+    try:
+        for row, content in iter_file_contents(dbx, files):
+            file_id_db, file_id, path_lower, path_display, name, extension = row
             
-            domain = result.get("domain", "")
-            if isinstance(domain, list):
-                domain = domain[0] if domain else ""
-            elif not isinstance(domain, str):
-                domain = ""
+            processed += 1
             
-            summary = result.get("summary", "")
-            if not isinstance(summary, str):
-                summary = str(summary) if summary else ""
+            # Afficher le fichier en cours
+            logger.info(f"[{processed}/{total}] {name}")
             
-            roget = result.get("roget_primary", "")
-            if not isinstance(roget, str):
-                roget = str(roget) if roget else ""
+            # Skip si extension non supportée
+            if extension and extension.lower() not in TEXT_EXTENSIONS:
+                queue_update(UPDATE_STATUS_SQL, ('skipped', datetime.now().isoformat(), file_id_db))
+                skipped += 1
+                continue
+            
+            # Contenu lu d'avance (local ou cloud)
+            if not content:
+                queue_update(UPDATE_STATUS_SQL, ('no_content', datetime.now().isoformat(), file_id_db))
+                skipped += 1
+                continue
             
-            importance = result.get("importance", 3)
-            if not isinstance(importance, int):
-                try:
-                    importance = int(importance)
-                except:
-                    importance = 3
-
-            cursor.execute('''
-                UPDATE files SET 
-                    summary = ?,
-                    domain = ?,
-                    keywords = ?,
-                    roget_codes = ?,
-                    importance = ?,
-                    status = 'enriched',
-                    enriched_at = ?
-                WHERE id = ?
-            ''', (
-                summary,
-                domain,
-                keywords,
-                roget,
-                importance,
-                datetime.now().isoformat(),
-                file_id_db
-            ))
-            enriched += 1
+            # Enrichir avec Mistral : seul, ou regroupé si le fichier est petit
+            if len(content) > PACK_FILE_CHARS:
+                submit([(content, name, extension)], [file_id_db])
+            else:
+                pack.append((content, name, extension))
+                pack_ids.append(file_id_db)
+                if len(pack) >= PACK_MAX_FILES:
+                    submit(pack, pack_ids)
+                    pack, pack_ids = [], []
+            
+            # Progression périodique
+            if processed % 10 == 0:
+                elapsed = time.time() - start_time
+                rate = processed / elapsed if elapsed > 0 else 0
+                eta = (total - processed) / rate if rate > 0 else 0
+                logger.info(f"Progression: {processed}/{total} ({enriched} enrichis, {errors} erreurs) - ETA: {eta/60:.1f} min")
         
-        # Commit périodique
-        if processed % 10 == 0:
-            conn.commit()
-            elapsed = time.time() - start_time
-            rate = processed / elapsed if elapsed > 0 else 0
-            eta = (total - processed) / rate if rate > 0 else 0
-            logger.info(f"Progression: {processed}/{total} ({enriched} enrichis, {errors} erreurs) - ETA: {eta/60:.1f} min")
-    
-    conn.commit()
+        # Dernier lot incomplet, puis derniers appels en vol
+        if pack:
+            submit(pack, pack_ids)
+        collect(as_completed(list(in_flight)))
+    finally:
+        # Interruption : résultats déjà reçus enregistrés, fichiers en vol restent 'pending'
+        pool.shutdown(wait=False, cancel_futures=True)
+        reader.close()
+        flush_updates()
     
     elapsed = time.time() - start_time
     
@@ -429,7 +662,7 @@ def process_files(conn: sqlite3.Connection, dbx: Optional[dropbox.Dropbox],
 def check_ollama():
     """Vérifie que Ollama est accessible."""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
+        response = OLLAMA_SESSION.get("http://localhost:11434/api/tags", timeout=5)
         if response.status_code == 200:
             models = [m["name"] for m in response.json().get("models", [])]
             if any(OLLAMA_MODEL in m for m in models):
@@ -468,6 +701,8 @@ def main():
     
     # Connexion DB
     conn = sqlite3.connect(str(DB_PATH))
+    tune_sqlite(conn)
+    ensure_schema(conn)
     
     # Client Dropbox (optionnel)
     dbx = get_dropbox_client()
@@ -5,6 +5,8 @@ v1.1.0 - 2026-01-09
 - FIX: L'archive ne contient plus le SYSTEM_CONTEXT (évite indexation du system prompt par Scribe)
 """
 
+import os
+import functools
 import tiktoken
 from pathlib import Path
 from datetime import datetime, timezone
@@ -74,14 +76,46 @@ def _strip_system_context(contenu: str) -> str:
     return contenu[separator_pos + 3:].lstrip()
 
 
-def count_tokens(text: str) -> int:
-    """Compte le nombre de tokens dans un texte."""
+def atomic_write_text(path: Path, contenu: str):
+    """
+    Écrit un fichier texte de façon atomique (fichier temporaire + os.replace) :
+    un lecteur concurrent voit l'ancienne ou la nouvelle version, jamais un fichier partiel.
+    """
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    tmp.write_text(contenu, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """Encodage tiktoken de MODEL, résolu une seule fois (None si indisponible)."""
     try:
-        encoding = tiktoken.encoding_for_model(MODEL)
-        return len(encoding.encode(text, disallowed_special=()))
+        return tiktoken.encoding_for_model(MODEL)
     except Exception:
-        # Fallback: estimation grossière (1 token ≈ 4 caractères)
-        return len(text) // 4
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Compte le nombre de tokens dans un texte."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        try:
+            return len(encoding.encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    # Fallback: estimation grossière (1 token ≈ 4 caractères)
+    return len(text) // 4
+
+
+def count_tokens_batch(texts: List[str]) -> List[int]:
+    """Compte les tokens de plusieurs textes en un seul appel (encode_batch, multi-thread natif)."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        try:
+            return [len(tokens) for tokens in encoding.encode_batch(texts, disallowed_special=())]
+        except Exception:
+            pass
+    return [len(text) // 4 for text in texts]
 
 
 def get_timestamp_zulu() -> str:
@@ -94,14 +128,16 @@ def should_rotate(current_tokens: int, incoming_tokens: int) -> bool:
     return (current_tokens + incoming_tokens) > THRESHOLD
 
 
-def validate_input_size(text: str) -> Tuple[bool, str]:
+def validate_input_size(text: str, tokens: int = None) -> Tuple[bool, str]:
     """
     Valide que l'input ne dépasse pas la capacité maximale.
+    tokens: compte déjà calculé par l'appelant (évite une seconde tokenisation).
     
     Returns:
         (is_valid, error_message)
     """
-    tokens = count_tokens(text)
+    if tokens is None:
+        tokens = count_tokens(text)
     if tokens > MAX_INPUT:
         return False, f"Message trop volumineux: {tokens} tokens. Maximum autorisé: {MAX_INPUT} tokens (environ {MAX_INPUT * 4} caractères)."
     return True, ""
@@ -252,7 +288,7 @@ def rotate_window(fenetre_path: Path, buffer_dir: Path, echanges_dir: Path = Non
     
     # Réinitialiser la fenêtre avec INSTRUCTIONS + OVERLAP
     instructions = load_system_instructions()
-    fenetre_path.write_text(instructions + overlap, encoding='utf-8')
+    atomic_write_text(fenetre_path, instructions + overlap)
     
     return {
         "status": "success",
@@ -56,7 +56,7 @@ class QueryProfile:
     strategy: Dict[str, Any]
     
     # Métadonnées de génération
-    intent: str  # "temporel", "personne", "thematique", "emotion", "mixte"
+    intent: str  # "temporel", "personne", "thematique", "emotion", "mixte", "conversation"
     confidence: float  # 0.0 à 1.0
     
     def to_dict(self) -> dict:
@@ -115,6 +115,7 @@ Tu dois retourner un JSON avec:
    - "thematique": sur quel sujet
    - "emotion": quel était l'état émotionnel
    - "mixte": combinaison de plusieurs
+   - "conversation": salutation, remerciement ou bavardage sans besoin de mémoire
 
 5. **confidence**: Confiance dans l'analyse (0.0 à 1.0)
 
@@ -0,0 +1,45 @@
+"""
+sqlite_tuning.py - Réglages SQLite partagés (PRAGMAs)
+Un seul endroit pour les PRAGMAs appliqués aux connexions fraîchement ouvertes.
+
+Usage:
+    from utils.sqlite_tuning import tune_sqlite
+
+    conn = sqlite3.connect(DB_PATH)
+    tune_sqlite(conn)
+"""
+
+import sqlite3
+
+# Chargement en masse (WAL : les lectures ne bloquent pas l'écrivain)
+BULK_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-200000;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Connexions applicatives concurrentes : écrivain temps réel du Scribe et
+# lecteurs Hermès (WAL persiste dans le fichier, le reste est par connexion)
+SHARED_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA busy_timeout=5000;
+    PRAGMA mmap_size=268435456;
+"""
+
+# Bibliothèques (piliers, relations...) : lectures courtes, pages chaudes par mmap
+LIBRARY_PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-64000;
+"""
+
+
+def tune_sqlite(conn: sqlite3.Connection, pragmas: str = BULK_PRAGMAS) -> sqlite3.Connection:
+    """Applique les PRAGMAs à une connexion fraîchement ouverte et la retourne."""
+    conn.executescript(pragmas)
+    return conn
@@ -186,6 +186,10 @@ DROP INDEX IF EXISTS "idx_piliers_categorie";
 CREATE INDEX idx_piliers_categorie ON piliers(categorie);
 DROP INDEX IF EXISTS "idx_piliers_importance";
 CREATE INDEX idx_piliers_importance ON piliers(importance);
+DROP INDEX IF EXISTS "idx_piliers_rank";
+CREATE INDEX idx_piliers_rank ON piliers(importance DESC, created_at DESC);
+DROP INDEX IF EXISTS "idx_piliers_sort";
+CREATE INDEX idx_piliers_sort ON piliers(categorie, importance DESC, created_at DESC, id, fait);
 DROP INDEX IF EXISTS "idx_poids_mnemique";
 CREATE INDEX idx_poids_mnemique ON metadata(poids_mnemique);
 DROP INDEX IF EXISTS "idx_projets_actif";
@@ -202,4 +206,38 @@ DROP INDEX IF EXISTS "idx_timestamp_epoch";
 CREATE INDEX idx_timestamp_epoch ON metadata(timestamp_epoch);
 DROP INDEX IF EXISTS "idx_token_start";
 CREATE INDEX idx_token_start ON metadata(token_start);
+DROP TABLE IF EXISTS "metadata_personnes_fts";
+CREATE VIRTUAL TABLE metadata_personnes_fts USING fts5(personnes, content='metadata', content_rowid='id');
+DROP TRIGGER IF EXISTS "metadata_personnes_fts_ai";
+CREATE TRIGGER metadata_personnes_fts_ai AFTER INSERT ON metadata BEGIN
+    INSERT INTO metadata_personnes_fts(rowid, personnes) VALUES (new.id, new.personnes);
+END;
+DROP TRIGGER IF EXISTS "metadata_personnes_fts_ad";
+CREATE TRIGGER metadata_personnes_fts_ad AFTER DELETE ON metadata BEGIN
+    INSERT INTO metadata_personnes_fts(metadata_personnes_fts, rowid, personnes) VALUES ('delete', old.id, old.personnes);
+END;
+DROP TRIGGER IF EXISTS "metadata_personnes_fts_au";
+CREATE TRIGGER metadata_personnes_fts_au AFTER UPDATE OF personnes ON metadata BEGIN
+    INSERT INTO metadata_personnes_fts(metadata_personnes_fts, rowid, personnes) VALUES ('delete', old.id, old.personnes);
+    INSERT INTO metadata_personnes_fts(rowid, personnes) VALUES (new.id, new.personnes);
+END;
+-- Base existante (metadata déjà remplie) : après ce bloc,
+-- INSERT INTO metadata_personnes_fts(metadata_personnes_fts) VALUES ('rebuild');
+DROP TABLE IF EXISTS "piliers_fts";
+CREATE VIRTUAL TABLE piliers_fts USING fts5(fait, content='piliers', content_rowid='id');
+DROP TRIGGER IF EXISTS "piliers_fts_ai";
+CREATE TRIGGER piliers_fts_ai AFTER INSERT ON piliers BEGIN
+    INSERT INTO piliers_fts(rowid, fait) VALUES (new.id, new.fait);
+END;
+DROP TRIGGER IF EXISTS "piliers_fts_ad";
+CREATE TRIGGER piliers_fts_ad AFTER DELETE ON piliers BEGIN
+    INSERT INTO piliers_fts(piliers_fts, rowid, fait) VALUES ('delete', old.id, old.fait);
+END;
+DROP TRIGGER IF EXISTS "piliers_fts_au";
+CREATE TRIGGER piliers_fts_au AFTER UPDATE OF fait ON piliers BEGIN
+    INSERT INTO piliers_fts(piliers_fts, rowid, fait) VALUES ('delete', old.id, old.fait);
+    INSERT INTO piliers_fts(rowid, fait) VALUES (new.id, new.fait);
+END;
+-- Base existante (piliers déjà remplie) : après ce bloc,
+-- INSERT INTO piliers_fts(piliers_fts) VALUES ('rebuild');
 COMMIT;